@@ -1,3 +1,75 @@
-from django.test import TestCase
+import shutil
+import tempfile
 
-# Create your tests here.
+from django.contrib.auth.models import User
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase, override_settings
+
+from interviews.tests import QueryBudgetMixin, ViewQueryTestBase
+from .models import Profile
+
+
+FAST_HASHERS = ["django.contrib.auth.hashers.MD5PasswordHasher"]
+
+
+@override_settings(PASSWORD_HASHERS=FAST_HASHERS)
+class AuthViewQueryTests(QueryBudgetMixin, TestCase):
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root, ignore_errors=True)
+
+    def test_login_form(self):
+        response = self.assertMaxQueries(0, self.client.get, "/login/")
+        self.assertEqual(response.status_code, 200)
+
+    def test_login(self):
+        user = User.objects.create_user("hr", "hr@example.com", "pw")
+        Profile.objects.create(user=user, role="HR")
+        response = self.assertMaxQueries(
+            10, self.client.post, "/login/", {"username": "hr", "password": "pw"},
+        )
+        self.assertRedirects(response, "/login/hr/dashboard/", fetch_redirect_response=False)
+
+    def test_register_form(self):
+        self.assertMaxQueries(0, self.client.get, "/login/register/")
+
+    def test_register_candidate(self):
+        resume = SimpleUploadedFile("cv.pdf", b"%PDF-1.4 resume", content_type="application/pdf")
+        with self.settings(MEDIA_ROOT=self.media_root):
+            response = self.assertMaxQueries(17, self.client.post, "/login/register/", {
+                "username": "newcandidate", "email": "new@example.com", "password": "pw",
+                "role": "CANDIDATE", "full_name": "New Candidate", "resume": resume,
+            })
+        self.assertRedirects(response, "/login/candidate/dashboard/", fetch_redirect_response=False)
+        self.assertEqual(Profile.objects.get(user__username="newcandidate").role, "CANDIDATE")
+
+    def test_logout(self):
+        self.client.force_login(User.objects.create_user("someone", password="pw"))
+        response = self.assertMaxQueries(4, self.client.get, "/login/logout/")
+        self.assertRedirects(response, "/login/", fetch_redirect_response=False)
+
+
+class DashboardQueryTests(ViewQueryTestBase):
+    def test_hr_dashboard(self):
+        self.login(self.hr)
+        response = self.assertMaxQueries(5, self.client.get, "/login/hr/dashboard/")
+        self.assertEqual(len(response.context["interviews"]), 3)
+        self.assertIndexedPlans()
+
+    def test_hr_dashboard_not_modified(self):
+        self.login(self.hr)
+        etag = self.client.get("/login/hr/dashboard/")["ETag"]
+        response = self.assertMaxQueries(3, self.client.get, "/login/hr/dashboard/", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+    def test_candidate_dashboard(self):
+        self.login(self.candidate)
+        response = self.assertMaxQueries(4, self.client.get, "/login/candidate/dashboard/")
+        self.assertContains(response, self.interview.title)
+        self.assertIndexedPlans()
+
+    def test_candidate_dashboard_not_modified(self):
+        self.login(self.candidate)
+        etag = self.client.get("/login/candidate/dashboard/")["ETag"]
+        response = self.assertMaxQueries(3, self.client.get, "/login/candidate/dashboard/", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
@@ -2,7 +2,11 @@ from django.shortcuts import render, redirect
 from django.contrib.auth import authenticate, login, logout
 from django.contrib import messages
 from django.contrib.auth.decorators import login_required
+from django.views.decorators.cache import cache_control
+from django.views.decorators.http import condition
+from django.views.decorators.vary import vary_on_cookie
 
+from interviews.conditional import candidate_dashboard_etag, candidate_dashboard_version, hr_dashboard_etag
 from interviews.models import Interview
 from .forms import RegisterForm
 from .models import Profile
@@ -117,8 +121,11 @@ def dashboard_redirect(request):
 # HR DASHBOARD
 # =========================
 @login_required
+@vary_on_cookie
+@cache_control(private=True, no_cache=True)
+@condition(etag_func=hr_dashboard_etag)
 def hr_dashboard(request):
-    interviews = Interview.objects.filter(created_by=request.user)
+    interviews = Interview.objects.filter(created_by=request.user, deletion_requested_at__isnull=True)
 
     # Try to get a friendly display name from Profile if available
     try:
@@ -141,10 +148,15 @@ def hr_dashboard(request):
 # CANDIDATE DASHBOARD
 # =========================
 @login_required
+@vary_on_cookie
+@cache_control(private=True, no_cache=True)
+@condition(etag_func=candidate_dashboard_etag)
 def candidate_dashboard(request):
-    interviews = Interview.objects.all()
+    # Lazy: only evaluated when the cached list fragments miss.
+    interviews = Interview.objects.filter(deletion_requested_at__isnull=True)
     return render(request, "accounts/candidate_dashboard.html", {
-        "interviews": interviews
+        "interviews": interviews,
+        "interviews_version": candidate_dashboard_version(request),
     })
 
 
@@ -1,8 +1,18 @@
 """
 Vercel serverless function for Django AI Interviewer
+
+The Python runtime hands each request to ``handler``, a
+BaseHTTPRequestHandler subclass. It translates the request into a WSGI
+environ, calls the Django application and writes the response back as the
+body iterable produces it. StreamingHttpResponse bodies (CSV/JSONL exports)
+go out chunk by chunk with chunked transfer encoding instead of being
+collected in memory first.
 """
 import os
 import sys
+from http.server import BaseHTTPRequestHandler
+from urllib.parse import unquote
+
 from django.core.wsgi import get_wsgi_application
 
 # Add project root to Python path
@@ -14,6 +24,111 @@ os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings_production')
 # Get WSGI application
 application = get_wsgi_application()
 
-# Vercel serverless handler
-def handler(request):
-    return application(request.environ, lambda status, headers: None)
+# Responses that never carry a body (RFC 9110).
+_NO_BODY_STATUSES = {204, 304}
+
+
+class handler(BaseHTTPRequestHandler):
+    """WSGI bridge for the Vercel Python runtime."""
+
+    protocol_version = "HTTP/1.1"
+
+    def _environ(self):
+        path, _, query = self.path.partition("?")
+        host, _, port = (self.headers.get("Host") or "localhost").partition(":")
+        scheme = (self.headers.get("X-Forwarded-Proto") or "http").split(",")[0].strip()
+        environ = {
+            "REQUEST_METHOD": self.command,
+            "SCRIPT_NAME": "",
+            # PEP 3333: PATH_INFO is the percent-decoded path as latin-1 "bytes".
+            "PATH_INFO": unquote(path, "iso-8859-1"),
+            "QUERY_STRING": query,
+            "SERVER_NAME": host,
+            "SERVER_PORT": port or ("443" if scheme == "https" else "80"),
+            "SERVER_PROTOCOL": self.request_version,
+            "REMOTE_ADDR": self.client_address[0] if self.client_address else "",
+            "CONTENT_TYPE": self.headers.get("Content-Type", ""),
+            "CONTENT_LENGTH": self.headers.get("Content-Length", ""),
+            "wsgi.version": (1, 0),
+            "wsgi.url_scheme": scheme,
+            "wsgi.input": self.rfile,
+            "wsgi.errors": sys.stderr,
+            "wsgi.multithread": False,
+            "wsgi.multiprocess": True,
+            "wsgi.run_once": False,
+        }
+        for name, value in self.headers.items():
+            # Like wsgiref, drop headers with underscores: they would be
+            # indistinguishable from dashed ones once converted.
+            if "_" in name:
+                continue
+            key = "HTTP_" + name.upper().replace("-", "_")
+            if key in ("HTTP_CONTENT_TYPE", "HTTP_CONTENT_LENGTH"):
+                continue
+            if key in environ:
+                # Repeated headers are joined like wsgiref does, except
+                # Cookie, whose pairs are separated by "; " (RFC 6265).
+                value = f"{environ[key]}{'; ' if key == 'HTTP_COOKIE' else ','}{value}"
+            environ[key] = value
+        return environ
+
+    def _handle(self):
+        state = {"status": None, "headers": None, "sent": False, "chunked": False, "bodyless": False}
+
+        def start_response(status, headers, exc_info=None):
+            if exc_info:
+                try:
+                    if state["sent"]:
+                        raise exc_info[1].with_traceback(exc_info[2])
+                finally:
+                    exc_info = None
+            elif state["status"] is not None:
+                raise AssertionError("start_response() called twice")
+            state["status"], state["headers"] = status, headers
+            return write
+
+        def send_headers():
+            code, _, reason = state["status"].partition(" ")
+            code = int(code)
+            self.send_response_only(code, reason or None)
+            names = set()
+            for name, value in state["headers"]:
+                names.add(name.lower())
+                self.send_header(name, value)
+            bodyless = self.command == "HEAD" or code in _NO_BODY_STATUSES or code < 200
+            if not bodyless and "content-length" not in names:
+                state["chunked"] = True
+                self.send_header("Transfer-Encoding", "chunked")
+            # One request per connection: a request body the view didn't read
+            # would otherwise be parsed as the next request.
+            self.send_header("Connection", "close")
+            self.end_headers()
+            state["bodyless"] = bodyless
+            state["sent"] = True
+
+        def write(data):
+            if state["status"] is None:
+                raise AssertionError("write() before start_response()")
+            if not state["sent"]:
+                send_headers()
+            if not data or state["bodyless"]:
+                return
+            if state["chunked"]:
+                self.wfile.write(b"%x\r\n%s\r\n" % (len(data), data))
+            else:
+                self.wfile.write(data)
+
+        result = application(self._environ(), start_response)
+        try:
+            for chunk in result:
+                write(chunk)
+            if not state["sent"]:
+                send_headers()
+            if state["chunked"]:
+                self.wfile.write(b"0\r\n\r\n")
+        finally:
+            if hasattr(result, "close"):
+                result.close()
+        self.wfile.flush()
+
+    do_GET = do_HEAD = do_POST = do_PUT = do_PATCH = do_DELETE = do_OPTIONS = _handle
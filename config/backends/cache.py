@@ -0,0 +1,37 @@
+"""
+Cache backends that count hits and misses for the request metrics.
+
+Drop-in replacements for Django's local-memory and Redis backends. Every
+``get()`` made while a request is being served is recorded as a hit or a
+miss on that request's RequestStats (config/metrics.py). Lookups outside a
+request, e.g. from management commands, are not recorded.
+
+    "BACKEND": "config.backends.cache.LocMemCache"
+"""
+from django.core.cache.backends import locmem, redis
+
+from config.metrics import record_cache_lookup
+
+
+_MISSING = object()
+
+
+class CountingCacheMixin:
+    def get(self, key, default=None, version=None):
+        value = super().get(key, _MISSING, version)
+        record_cache_lookup(value is not _MISSING)
+        return default if value is _MISSING else value
+
+
+class LocMemCache(CountingCacheMixin, locmem.LocMemCache):
+    # BaseCache.get_many() calls get() per key, so those lookups are counted too.
+    pass
+
+
+class RedisCache(CountingCacheMixin, redis.RedisCache):
+    def get_many(self, keys, version=None):
+        keys = list(keys)
+        found = super().get_many(keys, version)
+        for key in keys:
+            record_cache_lookup(key in found)
+        return found
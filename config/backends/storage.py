@@ -0,0 +1,27 @@
+"""
+Static files storage for production.
+
+whitenoise's CompressedManifestStaticFilesStorage (hashed names, .gz/.br
+variants, immutable caching) minus the rewriting of ``sourceMappingURL``
+comments. Django fails collectstatic when a referenced map is missing, and
+the vendored Bootstrap files are kept without their maps (see
+interviews/assets.py): only files with a pinned hash are vendored. The
+comments are left as they are; browsers only fetch maps with devtools open.
+
+    'BACKEND': 'config.backends.storage.CompressedManifestStaticFilesStorage'
+"""
+from whitenoise import storage
+
+
+def _without_source_maps(patterns):
+    return tuple(
+        (extension, tuple(
+            pattern for pattern in extension_patterns
+            if "sourceMappingURL" not in (pattern[0] if isinstance(pattern, tuple) else pattern)
+        ))
+        for extension, extension_patterns in patterns
+    )
+
+
+class CompressedManifestStaticFilesStorage(storage.CompressedManifestStaticFilesStorage):
+    patterns = _without_source_maps(storage.CompressedManifestStaticFilesStorage.patterns)
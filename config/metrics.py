@@ -0,0 +1,228 @@
+"""
+Per-request timing and query metrics, exposed in the Prometheus text format.
+
+RequestMetricsMiddleware (config/middleware.py) gives every request a
+RequestStats. While the request runs, its queries (via a database
+execute_wrapper), cache lookups (config/backends/cache.py) and AI calls
+(``timed_ai`` in interviews/ai.py) are added to it. When the response is
+returned the totals go into the histograms below, labelled with the URL name
+of the view. Paths are never used as labels, which keeps the number of series
+bounded.
+
+The registry lives in process memory. Each gunicorn worker keeps and serves
+its own numbers, so a scrape of /metrics reflects whichever worker answered.
+Prometheus' rate() and histogram_quantile() still work on those series; run
+a single worker (or one scrape target per worker) for exact totals.
+"""
+import bisect
+import contextvars
+import threading
+import time
+from functools import wraps
+
+
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 200, 500)
+BATCH_BUCKETS = (1, 2, 4, 8, 16, 32, 64)
+
+_current = contextvars.ContextVar("request_stats", default=None)
+
+
+class RequestStats:
+    """What one request spent its time on."""
+
+    def __init__(self):
+        self.queries = 0
+        self.sql_seconds = 0.0
+        self.statements = {}  # sql -> [count, seconds]
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.ai_calls = 0
+        self.ai_seconds = 0.0
+
+    def add_query(self, sql, seconds):
+        self.queries += 1
+        self.sql_seconds += seconds
+        entry = self.statements.setdefault(sql, [0, 0.0])
+        entry[0] += 1
+        entry[1] += seconds
+
+    def top_statements(self, limit):
+        """[(sql, count, seconds)] with the largest total time first."""
+        ranked = sorted(self.statements.items(), key=lambda item: item[1][1], reverse=True)
+        return [(sql, count, seconds) for sql, (count, seconds) in ranked[:limit]]
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names, values, extra=()):
+    pairs = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)] + list(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+class Counter:
+    kind = "counter"
+
+    def __init__(self, name, documentation, labelnames=()):
+        self.name, self.documentation, self.labelnames = name, documentation, tuple(labelnames)
+        self._values = {}
+
+    def inc(self, amount=1, **labels):
+        key = tuple(labels[n] for n in self.labelnames)
+        self._values[key] = self._values.get(key, 0) + amount
+
+    def samples(self):
+        for key, value in sorted(self._values.items()):
+            yield f"{self.name}{_labels(self.labelnames, key)} {value}"
+
+
+class Histogram:
+    kind = "histogram"
+
+    def __init__(self, name, documentation, labelnames=(), buckets=DURATION_BUCKETS):
+        self.name, self.documentation, self.labelnames = name, documentation, tuple(labelnames)
+        self.buckets = tuple(buckets)
+        self._series = {}  # label values -> [per-bucket counts..., +Inf count, sum]
+
+    def observe(self, value, **labels):
+        key = tuple(labels[n] for n in self.labelnames)
+        series = self._series.get(key)
+        if series is None:
+            series = self._series[key] = [0] * (len(self.buckets) + 1) + [0.0]
+        series[bisect.bisect_left(self.buckets, value)] += 1
+        series[-1] += value
+
+    def samples(self):
+        for key, series in sorted(self._series.items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets + ("+Inf",), series):
+                cumulative += count
+                le = 'le="%s"' % bound
+                yield f"{self.name}_bucket{_labels(self.labelnames, key, [le])} {cumulative}"
+            yield f"{self.name}_sum{_labels(self.labelnames, key)} {series[-1]}"
+            yield f"{self.name}_count{_labels(self.labelnames, key)} {cumulative}"
+
+
+class Registry:
+    def __init__(self):
+        self._metrics = []
+        self.lock = threading.Lock()
+
+    def register(self, metric):
+        self._metrics.append(metric)
+        return metric
+
+    def render(self):
+        lines = []
+        with self.lock:
+            for metric in self._metrics:
+                lines.append(f"# HELP {metric.name} {metric.documentation}")
+                lines.append(f"# TYPE {metric.name} {metric.kind}")
+                lines.extend(metric.samples())
+        return "\n".join(lines) + "\n"
+
+
+registry = Registry()
+
+request_duration = registry.register(Histogram(
+    "http_request_duration_seconds", "Time until the view's response was returned.",
+    ["view", "method", "status"],
+))
+request_queries = registry.register(Histogram(
+    "http_request_db_queries", "Database queries per request.", ["view"], buckets=QUERY_BUCKETS,
+))
+request_sql_seconds = registry.register(Histogram(
+    "http_request_db_seconds", "Time spent executing SQL per request.", ["view"],
+))
+request_ai_seconds = registry.register(Histogram(
+    "http_request_ai_seconds", "Time spent in interviews.ai per request.", ["view"],
+))
+cache_lookups = registry.register(Counter(
+    "cache_lookups_total", "Cache get() calls made while serving requests, by result.", ["view", "result"],
+))
+ai_duration = registry.register(Histogram(
+    "ai_call_duration_seconds", "Duration of interviews.ai calls, including fallbacks.", ["function"],
+))
+evaluation_batch_size = registry.register(Histogram(
+    "ai_evaluation_batch_size", "Answers per evaluation batch sent by interviews/batching.py.",
+    buckets=BATCH_BUCKETS,
+))
+evaluation_batches = registry.register(Counter(
+    "ai_evaluation_batches_total", "Evaluation batches by outcome (ok, partial, failed).", ["outcome"],
+))
+
+
+def current_stats():
+    return _current.get()
+
+
+def activate(stats):
+    return _current.set(stats)
+
+
+def deactivate(token):
+    _current.reset(token)
+
+
+def query_wrapper(execute, sql, params, many, context):
+    """Database execute_wrapper that times each query into the current RequestStats."""
+    stats = _current.get()
+    if stats is None:
+        return execute(sql, params, many, context)
+    start = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        stats.add_query(sql, time.perf_counter() - start)
+
+
+def record_cache_lookup(hit):
+    stats = _current.get()
+    if stats is None:
+        return
+    if hit:
+        stats.cache_hits += 1
+    else:
+        stats.cache_misses += 1
+
+
+def record_ai_call(function, seconds):
+    """Count one AI call of ``seconds``, per function and in the current request."""
+    with registry.lock:
+        ai_duration.observe(seconds, function=function)
+    stats = _current.get()
+    if stats is not None:
+        stats.ai_calls += 1
+        stats.ai_seconds += seconds
+
+
+def timed_ai(func):
+    """Time calls to an interviews.ai function, per call and per request."""
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            record_ai_call(func.__name__, time.perf_counter() - start)
+    return wrapper
+
+
+def observe_evaluation_batch(size, outcome):
+    with registry.lock:
+        evaluation_batch_size.observe(size)
+        evaluation_batches.inc(outcome=outcome)
+
+
+def observe_request(view, method, status, seconds, stats):
+    with registry.lock:
+        request_duration.observe(seconds, view=view, method=method, status=status)
+        request_queries.observe(stats.queries, view=view)
+        request_sql_seconds.observe(stats.sql_seconds, view=view)
+        request_ai_seconds.observe(stats.ai_seconds, view=view)
+        if stats.cache_hits:
+            cache_lookups.inc(stats.cache_hits, view=view, result="hit")
+        if stats.cache_misses:
+            cache_lookups.inc(stats.cache_misses, view=view, result="miss")
@@ -0,0 +1,79 @@
+import logging
+import time
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.db import connections
+
+from config import metrics, profiling
+
+
+logger = logging.getLogger(__name__)
+
+METHODS = {"GET", "HEAD", "POST", "PUT", "PATCH", "DELETE", "OPTIONS"}
+
+
+def _view_name(request):
+    match = getattr(request, "resolver_match", None)
+    return match.view_name if match is not None else "unresolved"
+
+
+class RequestMetricsMiddleware:
+    """Record wall time, queries, SQL time, cache lookups and AI time per view
+    (see config/metrics.py), and log requests slower than SLOW_REQUEST_SECONDS
+    together with their most expensive SQL statements.
+
+    Put it first in MIDDLEWARE so the time covers the other middleware too.
+    Streaming responses are measured up to the point the response is
+    returned, not until the last chunk is sent.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.slow_seconds = getattr(settings, "SLOW_REQUEST_SECONDS", 1.0)
+        self.top_sql = getattr(settings, "SLOW_REQUEST_TOP_SQL", 5)
+
+    def __call__(self, request):
+        stats = metrics.RequestStats()
+        token = metrics.activate(stats)
+        start = time.perf_counter()
+        try:
+            with ExitStack() as stack:
+                for connection in connections.all():
+                    stack.enter_context(connection.execute_wrapper(metrics.query_wrapper))
+                response = self.get_response(request)
+        finally:
+            metrics.deactivate(token)
+        elapsed = time.perf_counter() - start
+
+        view = _view_name(request)
+        method = request.method if request.method in METHODS else "other"
+        metrics.observe_request(view, method, str(response.status_code), elapsed, stats)
+        if self.slow_seconds and elapsed >= self.slow_seconds:
+            self._log_slow(request, view, response, elapsed, stats)
+        return response
+
+    def _log_slow(self, request, view, response, elapsed, stats):
+        lines = [
+            f"Slow request: {request.method} {request.path} ({view}) -> {response.status_code} "
+            f"in {elapsed:.3f}s; {stats.queries} queries, {stats.sql_seconds:.3f}s SQL, "
+            f"cache {stats.cache_hits} hits / {stats.cache_misses} misses, "
+            f"{stats.ai_calls} AI calls, {stats.ai_seconds:.3f}s AI"
+        ]
+        for sql, count, seconds in stats.top_statements(self.top_sql):
+            lines.append(f"  {seconds:.3f}s {count}x {sql[:500]}")
+        logger.warning("\n".join(lines))
+
+
+class ProfilingMiddleware:
+    """Profile requests from staff users that ask for it with ``?_profile=1``
+    or an ``X-Profile`` header (see config/profiling.py). Goes after
+    AuthenticationMiddleware, which sets request.user."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if profiling.wants_profile(request):
+            return profiling.capture(request, self.get_response)
+        return self.get_response(request)
@@ -0,0 +1,157 @@
+"""
+On-demand profiling of single requests.
+
+A staff user adds ``?_profile=1`` to a URL (or sends ``X-Profile: 1``) and
+ProfilingMiddleware (config/middleware.py) runs that request under two
+profilers at once:
+
+- cProfile, saved as a ``.prof`` pstats file (``python -m pstats``,
+  snakeviz);
+- a sampler thread that records the request thread's stack every
+  PROFILE_SAMPLE_INTERVAL seconds, saved as ``.collapsed`` folded stacks
+  (flamegraph.pl, speedscope, inferno).
+
+Captures are written to PROFILE_DIR along with a small JSON description.
+Only the newest PROFILE_MAX_CAPTURES are kept. The response carries the
+capture id in ``X-Profile-Id``. Captures are listed and downloaded at
+/admin/profiles/.
+"""
+import cProfile
+import json
+import os
+import re
+import sys
+import threading
+import time
+import uuid
+from collections import Counter
+
+from django.conf import settings
+from django.utils import timezone
+
+
+KINDS = {"prof": "application/octet-stream", "collapsed": "text/plain; charset=utf-8"}
+CAPTURE_ID = re.compile(r"^\d{8}T\d{12}-[0-9a-f]{8}$")
+
+
+def profile_dir():
+    return str(getattr(settings, "PROFILE_DIR", settings.BASE_DIR / "profiles"))
+
+
+def wants_profile(request):
+    user = getattr(request, "user", None)
+    if user is None or not user.is_staff:
+        return False
+    return bool(request.GET.get("_profile") or request.headers.get("X-Profile"))
+
+
+class StackSampler:
+    """Samples one thread's Python stack into folded-stack counts."""
+
+    def __init__(self, thread_id, interval):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="request-profiler", daemon=True)
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            names = []
+            while frame is not None:
+                code = frame.f_code
+                names.append(f"{frame.f_globals.get('__name__', '?')}.{code.co_qualname}")
+                frame = frame.f_back
+            if names:
+                self.stacks[";".join(reversed(names))] += 1
+
+    def collapsed(self):
+        return "".join(f"{stack} {count}\n" for stack, count in self.stacks.most_common())
+
+
+def capture(request, get_response):
+    """Run ``get_response(request)`` under the profilers and store the result."""
+    interval = getattr(settings, "PROFILE_SAMPLE_INTERVAL", 0.005)
+    profiler = cProfile.Profile()
+    start = time.perf_counter()
+    with StackSampler(threading.get_ident(), interval) as sampler:
+        profiler.enable()
+        try:
+            response = get_response(request)
+        finally:
+            profiler.disable()
+    elapsed = time.perf_counter() - start
+
+    match = getattr(request, "resolver_match", None)
+    capture_id = save_capture(profiler, sampler.collapsed(), {
+        "method": request.method,
+        "path": request.get_full_path(),
+        "view": match.view_name if match is not None else "",
+        "user": request.user.get_username(),
+        "status": response.status_code,
+        "seconds": round(elapsed, 4),
+        "samples": sum(sampler.stacks.values()),
+    })
+    response["X-Profile-Id"] = capture_id
+    return response
+
+
+def save_capture(profiler, collapsed, meta):
+    directory = profile_dir()
+    os.makedirs(directory, exist_ok=True)
+    now = timezone.now()
+    capture_id = f"{now:%Y%m%dT%H%M%S%f}-{uuid.uuid4().hex[:8]}"
+    base = os.path.join(directory, capture_id)
+    profiler.dump_stats(base + ".prof")
+    with open(base + ".collapsed", "w", encoding="utf-8") as out:
+        out.write(collapsed)
+    # Written last: a capture is listed only once all its files exist.
+    with open(base + ".json", "w", encoding="utf-8") as out:
+        json.dump({"id": capture_id, "captured_at": now.isoformat(), **meta}, out)
+    prune(getattr(settings, "PROFILE_MAX_CAPTURES", 50))
+    return capture_id
+
+
+def list_captures():
+    """Descriptions of the stored captures, newest first."""
+    directory = profile_dir()
+    try:
+        names = os.listdir(directory)
+    except FileNotFoundError:
+        return []
+    captures = []
+    for name in sorted(names, reverse=True):
+        if not name.endswith(".json"):
+            continue
+        try:
+            with open(os.path.join(directory, name), encoding="utf-8") as f:
+                captures.append(json.load(f))
+        except (OSError, ValueError):
+            continue  # pruned by another worker, or half written
+    return captures
+
+
+def prune(keep):
+    for meta in list_captures()[keep:]:
+        for ext in ("json", *KINDS):
+            try:
+                os.remove(os.path.join(profile_dir(), f"{meta['id']}.{ext}"))
+            except FileNotFoundError:
+                pass
+
+
+def capture_path(capture_id, kind):
+    """Path of a stored capture file, or None for unknown ids and kinds."""
+    if kind not in KINDS or not CAPTURE_ID.match(capture_id):
+        return None
+    path = os.path.join(profile_dir(), f"{capture_id}.{kind}")
+    return path if os.path.exists(path) else None
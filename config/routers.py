@@ -0,0 +1,79 @@
+"""
+Database router that sends HR reporting reads to a read replica.
+
+Only views wrapped in ``@read_from_replica`` read from the ``replica`` alias;
+everything else, and every write, stays on ``default``. When no replica is
+configured (no ``DATABASE_REPLICA_URL``) the router is a no-op.
+
+Replicas lag behind the primary, so after an HR user changes data (e.g.
+``delete_answer``) the view calls ``pin_to_primary(request)`` and that
+user's reporting views read from the primary for the next
+``REPLICA_PIN_SECONDS`` seconds, so they see their own change.
+"""
+import contextvars
+import time
+from functools import wraps
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS
+
+
+REPLICA_ALIAS = "replica"
+SESSION_PIN_KEY = "db_primary_until"
+
+# Sessions are read before the view runs and written at the end of it, they
+# must never come from a lagging copy.
+PRIMARY_ONLY_APPS = {"sessions"}
+
+_use_replica = contextvars.ContextVar("use_replica", default=False)
+
+
+def replica_configured():
+    return REPLICA_ALIAS in settings.DATABASES
+
+
+def pin_to_primary(request):
+    """Make this user's reporting reads hit the primary for a short while."""
+    request.session[SESSION_PIN_KEY] = time.time() + getattr(settings, "REPLICA_PIN_SECONDS", 10)
+
+
+def is_pinned_to_primary(request):
+    session = getattr(request, "session", None)
+    return session is not None and session.get(SESSION_PIN_KEY, 0) > time.time()
+
+
+def read_from_replica(view_func):
+    """Run a read-only view with its ORM reads routed to the replica."""
+    @wraps(view_func)
+    def _wrapped(request, *args, **kwargs):
+        if request.method not in ("GET", "HEAD") or not replica_configured() or is_pinned_to_primary(request):
+            return view_func(request, *args, **kwargs)
+        token = _use_replica.set(True)
+        try:
+            return view_func(request, *args, **kwargs)
+        finally:
+            _use_replica.reset(token)
+    return _wrapped
+
+
+class ReplicaRouter:
+
+    def db_for_read(self, model, **hints):
+        if _use_replica.get() and model._meta.app_label not in PRIMARY_ONLY_APPS and replica_configured():
+            return REPLICA_ALIAS
+        return None
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        dbs = {DEFAULT_DB_ALIAS, REPLICA_ALIAS}
+        if obj1._state.db in dbs and obj2._state.db in dbs:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # The replica gets its schema from the primary.
+        if db == REPLICA_ALIAS:
+            return False
+        return None
@@ -13,6 +13,8 @@ https://docs.djangoproject.com/en/6.0/ref/settings/
 from pathlib import Path
 import os
 
+from config.database import database_from_env, replica_from_env
+
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
 
@@ -43,11 +45,14 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'config.middleware.RequestMetricsMiddleware',
     'django.middleware.security.SecurityMiddleware',
+    'django.middleware.gzip.GZipMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'config.middleware.ProfilingMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
@@ -84,13 +89,68 @@ LOGGING = {
 # Database
 # https://docs.djangoproject.com/en/6.0/ref/settings/#databases
 
+# DATABASE_URL selects the database (PostgreSQL in production); without it
+# SQLite is opened through config.backends.sqlite3, which enables WAL, a busy
+# timeout and BEGIN IMMEDIATE so several gunicorn workers can write without
+# "database is locked" errors (see the bench_sqlite_contention command).
 DATABASES = {
-    'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db.sqlite3',
-    }
+    'default': database_from_env(BASE_DIR / 'db.sqlite3'),
 }
 
+# Optional read replica (DATABASE_REPLICA_URL) for the HR reporting views.
+# Locally a second SQLite file can stand in for it, see config/routers.py.
+replica = replica_from_env()
+if replica:
+    DATABASES['replica'] = replica
+DATABASE_ROUTERS = ['config.routers.ReplicaRouter']
+REPLICA_PIN_SECONDS = int(os.environ.get('REPLICA_PIN_SECONDS', '10'))
+
+
+# Cache
+# Local memory by default; set REDIS_URL to share the cache between workers.
+# The backends are Django's, plus hit/miss counting for /metrics.
+if os.environ.get('REDIS_URL'):
+    CACHES = {
+        'default': {
+            'BACKEND': 'config.backends.cache.RedisCache',
+            'LOCATION': os.environ['REDIS_URL'],
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'config.backends.cache.LocMemCache',
+            'LOCATION': 'ai-interviewer',
+        }
+    }
+
+# Row fragments of hr_results / candidate_dashboard ({% cache ... using="fragments" %}).
+# Keys include each row's updated_at, so entries never go stale. Off by
+# default in development, where templates change under you.
+if os.getenv('TEMPLATE_FRAGMENT_CACHE', 'False').lower() == 'true':
+    CACHES['fragments'] = {**CACHES['default'], 'KEY_PREFIX': 'fragments'}
+    if CACHES['default']['BACKEND'].endswith('LocMemCache'):
+        CACHES['fragments'].update(LOCATION='fragments', OPTIONS={'MAX_ENTRIES': 20000})
+else:
+    CACHES['fragments'] = {'BACKEND': 'django.core.cache.backends.dummy.DummyCache'}
+
+# Seconds an Interview stays in the object cache (interviews/cache.py).
+INTERVIEW_CACHE_TIMEOUT = int(os.environ.get('INTERVIEW_CACHE_TIMEOUT', '300'))
+
+# Request metrics (config/metrics.py). /metrics is served to staff users and
+# to scrapers sending "Authorization: Bearer <METRICS_TOKEN>". Requests slower
+# than SLOW_REQUEST_SECONDS are logged with their top SQL statements (0 turns
+# the log off).
+METRICS_TOKEN = os.getenv('METRICS_TOKEN', '')
+SLOW_REQUEST_SECONDS = float(os.getenv('SLOW_REQUEST_SECONDS', '1.0'))
+SLOW_REQUEST_TOP_SQL = int(os.getenv('SLOW_REQUEST_TOP_SQL', '5'))
+
+# Staff-only request profiles (?_profile=1, config/profiling.py), listed at
+# /admin/profiles/. Only the newest PROFILE_MAX_CAPTURES are kept.
+PROFILE_DIR = os.getenv('PROFILE_DIR', str(BASE_DIR / 'profiles'))
+PROFILE_MAX_CAPTURES = int(os.getenv('PROFILE_MAX_CAPTURES', '50'))
+PROFILE_SAMPLE_INTERVAL = float(os.getenv('PROFILE_SAMPLE_INTERVAL', '0.005'))
+
 
 # Password validation
 # https://docs.djangoproject.com/en/6.0/ref/settings/#auth-password-validators
@@ -145,4 +205,35 @@ SECURE_HSTS_PRELOAD = os.environ.get('SECURE_HSTS_PRELOAD', 'False').lower() ==
 
 LOGIN_URL = '/login/'
 GOOGLE_API_KEY = os.getenv("GOOGLE_API_KEY")
-GEMINI_CALLBACK_TOKEN = os.getenv("GEMINI_CALLBACK_TOKEN", 'replace-with-strong-secret')
\ No newline at end of file
+GEMINI_CALLBACK_TOKEN = os.getenv("GEMINI_CALLBACK_TOKEN", 'replace-with-strong-secret')
+# Queue api_callback payloads for process_callback_inbox instead of
+# ingesting them inside the request. Only turn it on where that worker runs
+# (the Procfile's ``worker``); otherwise queued callbacks are never ingested.
+CALLBACK_INBOX = os.getenv("CALLBACK_INBOX", 'False').lower() == 'true'
+
+# Retention: apply_retention archives and deletes rows older than this many
+# days. Unset (or 0) keeps them forever.
+RETENTION_DAYS = {
+    kind: int(os.getenv(f'RETENTION_{kind.upper()}_DAYS') or 0) or None
+    for kind in ('answers', 'asked_questions', 'results')
+}
+# Ingested callback inbox rows are only kept for troubleshooting.
+RETENTION_DAYS['callback_inbox'] = int(os.getenv('RETENTION_CALLBACK_INBOX_DAYS', '30')) or None
+RETENTION_ARCHIVE_DIR = os.getenv('RETENTION_ARCHIVE_DIR', str(BASE_DIR / 'archive'))
+# Interviews with more answers/asked questions than this are deleted in
+# batches: in the request, or with INTERVIEW_DELETE_IN_BACKGROUND by
+# process_deletions (only turn it on where that worker runs, e.g. the
+# Procfile's ``cleanup``).
+INTERVIEW_DELETE_INLINE_ROWS = int(os.getenv('INTERVIEW_DELETE_INLINE_ROWS', '1000'))
+INTERVIEW_DELETE_IN_BACKGROUND = os.getenv('INTERVIEW_DELETE_IN_BACKGROUND', 'False').lower() == 'true'
+# Question bank: questions pre-generated per interview by warm_question_bank,
+# and the model request rate the warm-up keeps to. With WARMUP_ON_SAVE the
+# bank is also filled in the background when HR creates or edits an interview.
+QUESTION_BANK_SIZE = int(os.getenv('QUESTION_BANK_SIZE', '10'))
+QUESTION_BANK_RATE_PER_MINUTE = int(os.getenv('QUESTION_BANK_RATE_PER_MINUTE', '60'))
+QUESTION_BANK_WARMUP_ON_SAVE = os.getenv('QUESTION_BANK_WARMUP_ON_SAVE', 'False').lower() == 'true'
+# Combine answer evaluations submitted by concurrent requests within WINDOW
+# seconds (at most MAX of them) into one model call; see interviews/batching.py.
+EVALUATION_BATCHING = os.getenv('EVALUATION_BATCHING', 'False').lower() == 'true'
+EVALUATION_BATCH_WINDOW = float(os.getenv('EVALUATION_BATCH_WINDOW', '0.05'))
+EVALUATION_BATCH_MAX = int(os.getenv('EVALUATION_BATCH_MAX', '16'))
\ No newline at end of file
@@ -6,6 +6,8 @@ Copy this to settings.py when deploying to production
 import os
 from pathlib import Path
 
+from config.database import database_from_env, replica_from_env
+
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
 
@@ -30,12 +32,15 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'config.middleware.RequestMetricsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'whitenoise.middleware.WhiteNoiseMiddleware',
+    'django.middleware.gzip.GZipMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'config.middleware.ProfilingMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
@@ -46,8 +51,14 @@ TEMPLATES = [
     {
         'BACKEND': 'django.template.backends.django.DjangoTemplates',
         'DIRS': [BASE_DIR / 'templates', BASE_DIR / 'config' / 'interviews' / 'templates'],
-        'APP_DIRS': True,
         'OPTIONS': {
+            # Compile each template once per process.
+            'loaders': [
+                ('django.template.loaders.cached.Loader', [
+                    'django.template.loaders.filesystem.Loader',
+                    'django.template.loaders.app_directories.Loader',
+                ]),
+            ],
             'context_processors': [
                 'django.template.context_processors.debug',
                 'django.template.context_processors.request',
@@ -59,24 +70,46 @@ TEMPLATES = [
 ]
 
 # Database
-# Use SQLite for Vercel (simpler deployment)
+# PostgreSQL when DATABASE_URL is set (persistent connections, pooling
+# through PgBouncer); otherwise SQLite for Vercel (simpler deployment), tuned for
+# concurrent workers: WAL journal, busy timeout and BEGIN IMMEDIATE writes.
+SQLITE_OPTIONS = {
+    'pragmas': {
+        'cache_size': -64000,
+    },
+}
 DATABASES = {
-    'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db.sqlite3',
-    }
+    'default': database_from_env(BASE_DIR / 'db.sqlite3', SQLITE_OPTIONS),
 }
 
+# Optional read replica (DATABASE_REPLICA_URL) for the HR reporting views.
+replica = replica_from_env(SQLITE_OPTIONS)
+if replica:
+    DATABASES['replica'] = replica
+DATABASE_ROUTERS = ['config.routers.ReplicaRouter']
+REPLICA_PIN_SECONDS = int(os.environ.get('REPLICA_PIN_SECONDS', '10'))
+
 # Password validation
 AUTH_PASSWORD_VALIDATORS = [
     {
-        'NAME': 'MinimumLengthValidator',
+        'NAME': 'django.contrib.auth.password_validation.UserAttributeSimilarityValidator',
+    },
+    {
+        'NAME': 'django.contrib.auth.password_validation.MinimumLengthValidator',
         'OPTIONS': {
             'min_length': 8,
         }
     },
+    {
+        'NAME': 'django.contrib.auth.password_validation.CommonPasswordValidator',
+    },
+    {
+        'NAME': 'django.contrib.auth.password_validation.NumericPasswordValidator',
+    },
 ]
 
+LOGIN_URL = '/login/'
+
 # Internationalization
 LANGUAGE_CODE = 'en-us'
 TIME_ZONE = 'UTC'
@@ -86,6 +119,13 @@ USE_TZ = True
 # Static files (CSS, JavaScript, Images)
 STATIC_URL = '/static/'
 STATIC_ROOT = BASE_DIR / 'staticfiles'
+# Hashed file names plus .gz/.br variants written at collectstatic time;
+# whitenoise serves hashed files with a one-year immutable Cache-Control.
+STORAGES = {
+    'default': {'BACKEND': 'django.core.files.storage.FileSystemStorage'},
+    'staticfiles': {'BACKEND': 'config.backends.storage.CompressedManifestStaticFilesStorage'},
+}
+WHITENOISE_MAX_AGE = int(os.environ.get('WHITENOISE_MAX_AGE', '3600'))  # unhashed files only
 
 # Default primary key field type
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
@@ -122,6 +162,8 @@ CORS_ALLOWED_ORIGINS = [
 
 # Security settings for production
 SECURE_SSL_REDIRECT = True
+# Render and Vercel terminate TLS and forward plain HTTP with this header.
+SECURE_PROXY_SSL_HEADER = ('HTTP_X_FORWARDED_PROTO', 'https')
 SESSION_COOKIE_SECURE = True
 CSRF_COOKIE_SECURE = True
 SECURE_BROWSER_XSS_FILTER = True
@@ -134,7 +176,7 @@ LOGGING = {
     'formatters': {
         'verbose': {
             'format': '{levelname} {asctime} {module} {process:d} {thread:d} {message}',
-            'style': '{level}',
+            'style': '{',
         },
     },
     'handlers': {
@@ -161,19 +203,97 @@ LOGGING = {
             'level': 'INFO',
             'propagate': True,
         },
+        'config.middleware': {
+            'handlers': ['file', 'console'],
+            'level': 'WARNING',
+            'propagate': False,
+        },
     },
 }
 
+# The log file needs logs/ to exist; on a read-only filesystem log to the
+# console only.
+try:
+    os.makedirs(BASE_DIR / 'logs', exist_ok=True)
+except OSError:
+    del LOGGING['handlers']['file']
+    for _logger in LOGGING['loggers'].values():
+        _logger['handlers'] = ['console']
+
 # Cache configuration (optional)
-CACHES = {
-    'default': {
-        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
-        'LOCATION': 'unique-snowflake',
+# Set REDIS_URL so every worker sees the same cache (and the same
+# invalidations, see interviews/cache.py).
+# The backends are Django's, plus hit/miss counting for /metrics.
+if os.environ.get('REDIS_URL'):
+    CACHES = {
+        'default': {
+            'BACKEND': 'config.backends.cache.RedisCache',
+            'LOCATION': os.environ['REDIS_URL'],
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'config.backends.cache.LocMemCache',
+            'LOCATION': 'unique-snowflake',
+        }
     }
-}
+
+# Row fragments of hr_results / candidate_dashboard ({% cache ... using="fragments" %}).
+# Keys include each row's updated_at, so entries never go stale.
+if os.environ.get('TEMPLATE_FRAGMENT_CACHE', 'True').lower() == 'true':
+    CACHES['fragments'] = {**CACHES['default'], 'KEY_PREFIX': 'fragments'}
+    if CACHES['default']['BACKEND'].endswith('LocMemCache'):
+        CACHES['fragments'].update(LOCATION='fragments', OPTIONS={'MAX_ENTRIES': 20000})
+else:
+    CACHES['fragments'] = {'BACKEND': 'django.core.cache.backends.dummy.DummyCache'}
+
+INTERVIEW_CACHE_TIMEOUT = int(os.environ.get('INTERVIEW_CACHE_TIMEOUT', '300'))
+
+# Request metrics (config/metrics.py). /metrics is served to staff users and
+# to scrapers sending "Authorization: Bearer <METRICS_TOKEN>". Requests slower
+# than SLOW_REQUEST_SECONDS are logged with their top SQL statements (0 turns
+# the log off).
+METRICS_TOKEN = os.environ.get('METRICS_TOKEN', '')
+SLOW_REQUEST_SECONDS = float(os.environ.get('SLOW_REQUEST_SECONDS', '1.0'))
+SLOW_REQUEST_TOP_SQL = int(os.environ.get('SLOW_REQUEST_TOP_SQL', '5'))
+
+# Staff-only request profiles (?_profile=1, config/profiling.py), listed at
+# /admin/profiles/. Only the newest PROFILE_MAX_CAPTURES are kept.
+PROFILE_DIR = os.environ.get('PROFILE_DIR', str(BASE_DIR / 'profiles'))
+PROFILE_MAX_CAPTURES = int(os.environ.get('PROFILE_MAX_CAPTURES', '50'))
+PROFILE_SAMPLE_INTERVAL = float(os.environ.get('PROFILE_SAMPLE_INTERVAL', '0.005'))
 
 # API Keys (set in environment variables)
 GOOGLE_API_KEY = os.environ.get('GOOGLE_API_KEY', '')
+GEMINI_CALLBACK_TOKEN = os.environ.get('GEMINI_CALLBACK_TOKEN', 'replace-with-strong-secret')
+
+# Queue api_callback payloads for process_callback_inbox instead of
+# ingesting them inside the request. Only turn it on where that worker runs
+# (the Procfile's ``worker``; Render and Vercel run none).
+CALLBACK_INBOX = os.environ.get('CALLBACK_INBOX', 'False').lower() == 'true'
+
+# Retention: apply_retention archives and deletes rows older than this many
+# days. Unset (or 0) keeps them forever.
+RETENTION_DAYS = {
+    kind: int(os.environ.get(f'RETENTION_{kind.upper()}_DAYS') or 0) or None
+    for kind in ('answers', 'asked_questions', 'results')
+}
+# Ingested callback inbox rows are only kept for troubleshooting.
+RETENTION_DAYS['callback_inbox'] = int(os.environ.get('RETENTION_CALLBACK_INBOX_DAYS', '30')) or None
+RETENTION_ARCHIVE_DIR = os.environ.get('RETENTION_ARCHIVE_DIR', str(BASE_DIR / 'archive'))
+# Interviews with more answers/asked questions than this are deleted in
+# batches: in the request, or with INTERVIEW_DELETE_IN_BACKGROUND by
+# process_deletions (only turn it on where that worker runs, e.g. the
+# Procfile's ``cleanup``).
+INTERVIEW_DELETE_INLINE_ROWS = int(os.environ.get('INTERVIEW_DELETE_INLINE_ROWS', '1000'))
+INTERVIEW_DELETE_IN_BACKGROUND = os.environ.get('INTERVIEW_DELETE_IN_BACKGROUND', 'False').lower() == 'true'
+QUESTION_BANK_SIZE = int(os.environ.get('QUESTION_BANK_SIZE', '10'))
+QUESTION_BANK_RATE_PER_MINUTE = int(os.environ.get('QUESTION_BANK_RATE_PER_MINUTE', '60'))
+QUESTION_BANK_WARMUP_ON_SAVE = os.environ.get('QUESTION_BANK_WARMUP_ON_SAVE', 'False').lower() == 'true'
+EVALUATION_BATCHING = os.environ.get('EVALUATION_BATCHING', 'False').lower() == 'true'
+EVALUATION_BATCH_WINDOW = float(os.environ.get('EVALUATION_BATCH_WINDOW', '0.05'))
+EVALUATION_BATCH_MAX = int(os.environ.get('EVALUATION_BATCH_MAX', '16'))
 
 # Custom user model
 AUTH_USER_MODEL = 'auth.User'
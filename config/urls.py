@@ -18,9 +18,15 @@ from django.contrib import admin
 from django.urls import path, include
 from django.views.generic import RedirectView
 
+from config.views import healthz, metrics, profile_download, profile_list
+
 urlpatterns = [
     path("", RedirectView.as_view(url="/login/", permanent=False)),
+    path("admin/profiles/", profile_list, name="profile_list"),
+    path("admin/profiles/<str:capture_id>.<str:kind>", profile_download, name="profile_download"),
     path("admin/", admin.site.urls),
+    path("healthz/", healthz, name="healthz"),
+    path("metrics", metrics, name="metrics"),
     path("login/", include("accounts.urls")),
     path("interviews/", include("interviews.urls")),
 ]
@@ -0,0 +1,56 @@
+import logging
+
+from django.conf import settings
+from django.db import connection
+from django.contrib.admin.views.decorators import staff_member_required
+from django.http import FileResponse, Http404, HttpResponse, HttpResponseForbidden, JsonResponse
+from django.shortcuts import render
+from django.utils.crypto import constant_time_compare
+
+from config import profiling
+from config.metrics import registry
+
+
+logger = logging.getLogger(__name__)
+
+
+def healthz(request):
+    """Liveness/readiness probe: confirms the database answers a trivial query."""
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT 1")
+            cursor.fetchone()
+    except Exception:
+        # The error text can name hosts and users; keep it in the log.
+        logger.exception("Health check query failed")
+        return JsonResponse({"ok": False, "database": connection.vendor, "error": "database unavailable"}, status=503)
+    return JsonResponse({"ok": True, "database": connection.vendor})
+
+
+def metrics(request):
+    """Prometheus scrape endpoint. Open to staff users and to requests that send
+    ``Authorization: Bearer <METRICS_TOKEN>``."""
+    token = getattr(settings, "METRICS_TOKEN", "")
+    authorization = request.headers.get("Authorization", "")
+    if not (request.user.is_staff or (token and constant_time_compare(authorization, f"Bearer {token}"))):
+        return HttpResponseForbidden()
+    return HttpResponse(registry.render(), content_type="text/plain; version=0.0.4; charset=utf-8")
+
+
+@staff_member_required
+def profile_list(request):
+    return render(request, "admin/request_profiles.html", {
+        "title": "Request profiles",
+        "captures": profiling.list_captures(),
+        "profile_dir": profiling.profile_dir(),
+    })
+
+
+@staff_member_required
+def profile_download(request, capture_id, kind):
+    path = profiling.capture_path(capture_id, kind)
+    if path is None:
+        raise Http404("No such capture.")
+    return FileResponse(
+        open(path, "rb"), as_attachment=True, filename=f"{capture_id}.{kind}", content_type=profiling.KINDS[kind],
+    )
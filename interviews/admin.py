@@ -1,5 +1,8 @@
 from django.contrib import admin
-from .models import Interview
+from django.utils import timezone
+
+from .models import CallbackInbox, Interview
+from .payloads import redact
 
 class InterviewAdmin(admin.ModelAdmin):
     def has_add_permission(self, request):
@@ -12,3 +15,28 @@ class InterviewAdmin(admin.ModelAdmin):
         return hasattr(request.user, 'userprofile') and request.user.userprofile.role == 'HR'
 
 admin.site.register(Interview, InterviewAdmin)
+
+
+@admin.register(CallbackInbox)
+class CallbackInboxAdmin(admin.ModelAdmin):
+    list_display = ("id", "interview", "status", "attempts", "received_at", "processed_at")
+    list_filter = ("status",)
+    # The raw payload is candidate data (and, for rows queued before tokens
+    # were stripped, the callback token): show a summary instead.
+    exclude = ("payload",)
+    readonly_fields = ("payload_summary", "result", "received_at", "processed_at")
+    actions = ["requeue"]
+
+    @admin.display(description="Payload")
+    def payload_summary(self, obj):
+        payload = redact(obj.payload)
+        if not isinstance(payload, dict):
+            return "-"
+        return f"{payload.get('candidate_username', '?')}: {len(payload.get('answers') or [])} answer(s)"
+
+    @admin.action(description="Requeue selected payloads")
+    def requeue(self, request, queryset):
+        count = queryset.exclude(status=CallbackInbox.STATUS_DONE).update(
+            status=CallbackInbox.STATUS_PENDING, attempts=0, available_at=timezone.now()
+        )
+        self.message_user(request, f"{count} payload(s) requeued.")
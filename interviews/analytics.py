@@ -0,0 +1,134 @@
+"""
+Per-interview score analytics for HR.
+
+All statistics are computed from two flat ``values_list`` pulls (answers and
+asked questions) with NumPy array operations: a single ``np.unique`` groups
+answers by candidate, and ``np.bincount`` with weights produces the
+per-candidate and per-question sums in one pass each, so there is no Python
+loop over answers. The result is a plain dict (JSON-ready) cached under the
+interview's answers and asked-questions versions, which signals.py and
+ingest.py bump whenever an answer is written or a question shown, so a
+dashboard is only recomputed after new activity.
+"""
+import numpy as np
+from django.core.cache import cache
+
+from .cache import answers_version_name, asked_version_name, versioned_key
+from .models import AskedQuestion, InterviewAnswer
+
+
+ANALYTICS_TIMEOUT = 600
+PERCENTILES = (10, 25, 50, 75, 90)
+MAX_SCORE = 10
+
+
+def _round(value, digits=2):
+    if value is None or np.isnan(value):
+        return None
+    return round(float(value), digits)
+
+
+def compute_interview_analytics(interview):
+    rows = list(
+        InterviewAnswer.objects.filter(interview=interview)
+        .values_list("candidate_id", "question_number", "ai_score")
+    )
+    started_ids = set(
+        AskedQuestion.objects.filter(interview=interview)
+        .values_list("candidate_id", flat=True).distinct()
+    )
+    total_questions = interview.number_of_questions
+
+    if rows:
+        # None scores become NaN under dtype=float.
+        data = np.array(rows, dtype=np.float64)
+    else:
+        data = np.empty((0, 3), dtype=np.float64)
+    candidate_ids = data[:, 0].astype(np.int64)
+    question_numbers = data[:, 1].astype(np.int64)
+    scores = data[:, 2]
+    scored = ~np.isnan(scores)
+    filled = np.where(scored, scores, 0.0)
+
+    # Score distribution over individual answers
+    clipped = np.clip(filled[scored], 0, MAX_SCORE).astype(np.int64)
+    histogram = np.bincount(clipped, minlength=MAX_SCORE + 1)
+
+    # Per-candidate averages
+    candidates, inverse = np.unique(candidate_ids, return_inverse=True)
+    cand_sum = np.bincount(inverse, weights=filled, minlength=len(candidates))
+    cand_scored = np.bincount(inverse, weights=scored.astype(np.float64), minlength=len(candidates))
+    cand_answered = np.bincount(inverse, minlength=len(candidates))
+    has_score = cand_scored > 0
+    cand_avg = cand_sum[has_score] / cand_scored[has_score]
+    if len(cand_avg):
+        pct_values = np.percentile(cand_avg, PERCENTILES)
+    else:
+        pct_values = [np.nan] * len(PERCENTILES)
+
+    # Per-question difficulty: mean and (population) variance of ai_score
+    # Question numbers come from api_callback payloads too; numbers beyond the
+    # interview's questions are left out rather than sizing the arrays.
+    valid_q = (question_numbers >= 0) & (question_numbers <= total_questions) & scored
+    size = total_questions + 1
+    q_count = np.bincount(question_numbers[valid_q], minlength=size)
+    q_sum = np.bincount(question_numbers[valid_q], weights=scores[valid_q], minlength=size)
+    q_sumsq = np.bincount(question_numbers[valid_q], weights=scores[valid_q] ** 2, minlength=size)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        q_mean = q_sum / q_count
+        q_var = q_sumsq / q_count - q_mean ** 2
+    questions = [
+        {
+            "question_number": n,
+            "answers": int(q_count[n]),
+            "mean": _round(q_mean[n]),
+            "variance": _round(max(q_var[n], 0.0)) if q_count[n] else None,
+            "std": _round(np.sqrt(max(q_var[n], 0.0))) if q_count[n] else None,
+        }
+        for n in range(1, size)
+    ]
+
+    # Funnel: how many candidates reached each question
+    started = len(started_ids | set(candidates.tolist()))
+    reached = [int((cand_answered >= k).sum()) for k in range(1, total_questions + 1)]
+    funnel = []
+    previous = started
+    for k, count in enumerate(reached, start=1):
+        funnel.append({
+            "question_number": k,
+            "candidates": count,
+            "drop_off": previous - count,
+            "rate": _round(count / started * 100, 1) if started else None,
+        })
+        previous = count
+    completed = reached[-1] if reached else 0
+
+    return {
+        "interview_id": interview.id,
+        "answers": int(len(rows)),
+        "scored_answers": int(scored.sum()),
+        "candidates_started": started,
+        "candidates_completed": completed,
+        "completion_rate": _round(completed / started * 100, 1) if started else None,
+        "mean_score": _round(filled[scored].mean()) if scored.any() else None,
+        "std_score": _round(filled[scored].std()) if scored.any() else None,
+        "score_histogram": [{"score": s, "count": int(c)} for s, c in enumerate(histogram[:MAX_SCORE + 1])],
+        "candidate_average_percentiles": {
+            f"p{p}": _round(v) for p, v in zip(PERCENTILES, pct_values)
+        },
+        "questions": questions,
+        "funnel": funnel,
+    }
+
+
+def get_interview_analytics(interview):
+    """Cached analytics for ``interview``; recomputed after answers or asked questions change."""
+    key = (
+        f"{versioned_key(answers_version_name(interview.id))}:"
+        f"{versioned_key(asked_version_name(interview.id))}:analytics"
+    )
+    stats = cache.get(key)
+    if stats is None:
+        stats = compute_interview_analytics(interview)
+        cache.set(key, stats, ANALYTICS_TIMEOUT)
+    return stats
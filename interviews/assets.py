@@ -0,0 +1,67 @@
+"""
+Third-party front-end assets (Bootstrap, Bootstrap Icons).
+
+Pinned copies are downloaded into ``interviews/static/vendor/`` by the
+``vendor_static_assets`` command, then collected by collectstatic with
+hashed names, gzip/brotli variants and immutable cache headers
+(whitenoise's CompressedManifestStaticFilesStorage, see
+settings_production.py). Templates reference them with
+``{% vendor_url "bootstrap.css" %}``. That tag returns the local static URL
+when the file has been vendored and collected, and the CDN URL otherwise,
+so a checkout that never ran the command still renders.
+
+``VENDOR_INTEGRITY`` pins the SRI hash of each vendored file; the command
+refuses a file that doesn't match, or that has no pin. Assets whose files
+are not all pinned yet stay on the CDN (``CDN_ASSETS``), and source maps are
+not vendored (see config/backends/storage.py).
+"""
+from functools import lru_cache
+
+from django.contrib.staticfiles import finders
+from django.templatetags.static import static
+
+
+BOOTSTRAP_VERSION = "5.3.2"
+ICONS_VERSION = "1.11.0"
+
+_BOOTSTRAP_CDN = f"https://cdn.jsdelivr.net/npm/bootstrap@{BOOTSTRAP_VERSION}/dist"
+_ICONS_CDN = f"https://cdn.jsdelivr.net/npm/bootstrap-icons@{ICONS_VERSION}/font"
+_BOOTSTRAP_DIR = f"vendor/bootstrap/{BOOTSTRAP_VERSION}"
+
+# name -> (static path, CDN URL)
+VENDOR_ASSETS = {
+    "bootstrap.css": (f"{_BOOTSTRAP_DIR}/bootstrap.min.css", f"{_BOOTSTRAP_CDN}/css/bootstrap.min.css"),
+    "bootstrap.js": (f"{_BOOTSTRAP_DIR}/bootstrap.bundle.min.js", f"{_BOOTSTRAP_CDN}/js/bootstrap.bundle.min.js"),
+}
+
+# name -> CDN URL, for assets that are not vendored. To vendor Bootstrap
+# Icons, move it to VENDOR_ASSETS, add its fonts (fonts/bootstrap-icons.woff2
+# and .woff, referenced from the CSS) to VENDOR_SUPPORT_FILES, and pin all
+# three in VENDOR_INTEGRITY.
+CDN_ASSETS = {
+    "bootstrap-icons.css": f"{_ICONS_CDN}/bootstrap-icons.css",
+}
+
+# static path -> CDN URL of files referenced from the vendored assets.
+VENDOR_SUPPORT_FILES = {}
+
+# static path -> "sha384-<base64>" of the published file. The command
+# refuses files without a pin and prints the hash to check and add here.
+VENDOR_INTEGRITY = {
+    f"{_BOOTSTRAP_DIR}/bootstrap.min.css": "sha384-T3c6CoIi6uLrA9TneNEoa7RxnatzjcDSCmG1MXxSR1GAsXEV/Dwwykc2MPK8M2HN",
+    f"{_BOOTSTRAP_DIR}/bootstrap.bundle.min.js": "sha384-C6RzsynM9kWDrMNeT87bh95OGNyZPhcTNXj1NW7RuBCsyN/o0jlpcV8Qyq46cDfL",
+}
+
+
+@lru_cache(maxsize=None)
+def vendor_url(name):
+    if name in CDN_ASSETS:
+        return CDN_ASSETS[name]
+    path, cdn_url = VENDOR_ASSETS[name]
+    if not finders.find(path):
+        return cdn_url
+    try:
+        return static(path)
+    except ValueError:
+        # Vendored but not collected: the manifest has no entry for it.
+        return cdn_url
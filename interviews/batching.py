@@ -0,0 +1,153 @@
+"""
+Cross-request micro-batching of answer evaluations.
+
+At peak many candidates submit answers within the same second, and each
+submission would make its own evaluate_answer call. With
+EVALUATION_BATCHING on, interview_session hands the answer to
+``evaluate_answer_batched`` instead. A dispatcher thread collects the
+evaluations that arrive within EVALUATION_BATCH_WINDOW seconds of the
+first one, up to EVALUATION_BATCH_MAX. It sends them, whatever their
+interview or candidate, as one structured ``evaluate_answers`` call and
+hands each reply back to the request waiting for it. The provider sees one
+request per batch instead of one per answer, which goes further under its
+rate limits.
+
+A batch of one is sent as a plain evaluate_answer call, so a quiet site
+behaves as before apart from the window's delay. If a batch fails, or the
+model leaves an item out, the requests concerned fall back to their own
+evaluate_answer call.
+
+Batches form inside one process, across its request threads: run gunicorn
+with ``--threads`` (or several async/gthread workers) for them to fill.
+Batch sizes and outcomes are exported on /metrics. Each caller's wait is
+in ai_call_duration_seconds{function="evaluate_answer_batched"}; a
+fallback call is counted separately, as evaluate_answer.
+
+A caller waits at most RESULT_TIMEOUT seconds for its batch, then falls
+back, so a stuck or dead dispatcher cannot hang request threads. The
+dispatcher is restarted on the next submission if its thread has died.
+"""
+import logging
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+
+from django.conf import settings
+
+from config.metrics import observe_evaluation_batch, record_ai_call
+
+from .ai import evaluate_answer, evaluate_answers
+
+
+logger = logging.getLogger(__name__)
+
+# Batches in flight at once; the dispatcher keeps collecting meanwhile.
+CONCURRENT_BATCHES = 4
+# Longest a caller waits for its batch before evaluating on its own.
+RESULT_TIMEOUT = 60.0
+
+
+def batching_enabled():
+    return getattr(settings, "EVALUATION_BATCHING", False)
+
+
+class EvaluationBatcher:
+    """Collects evaluation requests from many threads into batched model calls."""
+
+    def __init__(self, window, max_size):
+        self.window = window
+        self.max_size = max(1, max_size)
+        self._queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._pid = None
+        self._thread = None
+
+    def submit(self, question, answer):
+        """Queue one evaluation; the Future resolves to a reply string, or None to fall back."""
+        self._start()
+        future = Future()
+        self._queue.put((question, answer, future))
+        return future
+
+    def _start(self):
+        # Started lazily, again in a forked worker, where the parent's
+        # threads don't exist, and again if the collector died.
+        with self._lock:
+            if self._pid == os.getpid() and self._thread.is_alive():
+                return
+            self._pid = os.getpid()
+            self._queue = queue.Queue()
+            self._pool = ThreadPoolExecutor(CONCURRENT_BATCHES, thread_name_prefix="evaluation-batch")
+            self._thread = threading.Thread(
+                target=self._collect, args=(self._queue,), name="evaluation-batcher", daemon=True,
+            )
+            self._thread.start()
+
+    def _collect(self, pending):
+        while True:
+            batch = [pending.get()]
+            deadline = time.monotonic() + self.window
+            while len(batch) < self.max_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(pending.get(timeout=remaining))
+                except queue.Empty:
+                    break
+            try:
+                self._pool.submit(self._dispatch, batch)
+            except RuntimeError:
+                # Pool shut down (interpreter exit): let the callers fall back.
+                for _question, _answer, future in batch:
+                    future.set_result(None)
+                return
+
+    def _dispatch(self, batch):
+        replies = [None] * len(batch)
+        outcome = "failed"
+        try:
+            if len(batch) == 1:
+                question, answer, _future = batch[0]
+                replies = [evaluate_answer(question, answer)]
+            else:
+                replies = evaluate_answers([(question, answer) for question, answer, _future in batch])
+            outcome = "ok" if all(replies) else "partial"
+        except Exception:
+            logger.exception("Evaluation batch of %s failed; callers fall back to single calls", len(batch))
+        finally:
+            observe_evaluation_batch(len(batch), outcome)
+            for (_question, _answer, future), reply in zip(batch, replies):
+                future.set_result(reply)
+
+
+_batcher = None
+_batcher_lock = threading.Lock()
+
+
+def get_batcher():
+    global _batcher
+    with _batcher_lock:
+        if _batcher is None:
+            _batcher = EvaluationBatcher(
+                getattr(settings, "EVALUATION_BATCH_WINDOW", 0.05),
+                getattr(settings, "EVALUATION_BATCH_MAX", 16),
+            )
+        return _batcher
+
+
+def evaluate_answer_batched(question, answer):
+    """Drop-in for evaluate_answer that shares a model call with concurrent requests."""
+    start = time.perf_counter()
+    try:
+        reply = get_batcher().submit(question, answer).result(timeout=RESULT_TIMEOUT)
+    except TimeoutError:
+        logger.warning("No evaluation batch reply after %ss; evaluating on its own", RESULT_TIMEOUT)
+        reply = None
+    # Only the wait is timed here; a fallback call times itself.
+    record_ai_call("evaluate_answer_batched", time.perf_counter() - start)
+    if reply is None:
+        reply = evaluate_answer(question, answer)
+    return reply
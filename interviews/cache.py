@@ -0,0 +1,98 @@
+"""
+Per-interview object cache, plus the version counters other per-interview
+caches (analytics) hang off.
+
+Interviews are read on every candidate request (each interview_session
+GET/POST and every ai_chat message) but only change through the HR edit and
+delete views. Entries are keyed by interview id plus a version number; the
+post_save/post_delete handlers in signals.py bump the version, which makes
+every previously cached copy unreachable at once.
+
+With the default LocMemCache each gunicorn worker has its own cache, so a
+change made in one worker can be served stale by another for up to
+INTERVIEW_CACHE_TIMEOUT seconds. Configure a shared cache (REDIS_URL) when
+that matters.
+"""
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.http import Http404
+
+from .models import Interview
+
+
+def _version_key(name):
+    return f"{name}:version"
+
+
+def _timeout():
+    return getattr(settings, "INTERVIEW_CACHE_TIMEOUT", 300)
+
+
+def get_version(name):
+    version = cache.get(_version_key(name))
+    if version is None:
+        # Seed from the clock so a version key that was evicted never comes
+        # back with a number an older cached copy still uses. add() so two
+        # workers racing here agree on one value.
+        cache.add(_version_key(name), time.time_ns(), None)
+        version = cache.get(_version_key(name))
+    return version
+
+
+def bump_version(name):
+    try:
+        cache.incr(_version_key(name))
+    except ValueError:
+        # No version stored (never read, or evicted): start a fresh one.
+        cache.set(_version_key(name), time.time_ns(), None)
+
+
+def versioned_key(name):
+    """Cache key for ``name`` that changes every time bump_version(name) runs."""
+    return f"{name}:v{get_version(name)}"
+
+
+def get_interview(interview_id):
+    """Return the Interview with this id, from cache when possible, or None."""
+    key = versioned_key(f"interview:{interview_id}")
+    interview = cache.get(key)
+    if interview is None:
+        interview = Interview.objects.filter(id=interview_id, deletion_requested_at__isnull=True).first()
+        if interview is None:
+            return None
+        cache.set(key, interview, _timeout())
+    return interview
+
+
+def get_interview_or_404(interview_id):
+    interview = get_interview(interview_id)
+    if interview is None:
+        raise Http404("No Interview matches the given query.")
+    return interview
+
+
+def invalidate_interview(interview_id):
+    bump_version(f"interview:{interview_id}")
+
+
+def answers_version_name(interview_id):
+    """Version namespace bumped whenever answers of this interview change.
+
+    Derived data (analytics) is cached under versioned_key() of this name.
+    """
+    return f"interview:{interview_id}:answers"
+
+
+def invalidate_answers(interview_id):
+    bump_version(answers_version_name(interview_id))
+
+
+def asked_version_name(interview_id):
+    """Version namespace bumped whenever a question of this interview is first shown to someone."""
+    return f"interview:{interview_id}:asked"
+
+
+def invalidate_asked_questions(interview_id):
+    bump_version(asked_version_name(interview_id))
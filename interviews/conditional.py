@@ -0,0 +1,85 @@
+"""
+ETag / Last-Modified functions for ``django.views.decorators.http.condition``.
+
+The interview pages depend on the interviews they show and on who is
+looking, so validators combine ``Interview.updated_at`` with the user id
+and a hash of the CSRF cookie. The pages embed CSRF tokens, and the cookie
+changes on login, so a 304 never revives a page whose forms would be
+rejected. Pages with pending flash messages are always rendered in full.
+
+The functions run before the view: interview_detail is validated from the
+cached interview (no query), and the dashboards from one aggregate query,
+so a repeat visit costs a 304 instead of the listing query and a render.
+"""
+import hashlib
+
+from django.conf import settings
+from django.contrib import messages
+from django.db.models import Count, Max
+
+from .cache import get_interview
+from .models import Interview
+
+
+def _has_messages(request):
+    # len() doesn't mark the messages as read.
+    return bool(len(messages.get_messages(request)))
+
+
+def _client_state(request):
+    csrf = request.COOKIES.get(settings.CSRF_COOKIE_NAME, "")
+    return f"{request.user.pk}:{hashlib.sha256(csrf.encode()).hexdigest()[:16]}"
+
+
+def _etag(*parts):
+    return hashlib.sha256(":".join(str(p) for p in parts).encode()).hexdigest()[:32]
+
+
+def interview_etag(request, interview_id):
+    if _has_messages(request):
+        return None
+    interview = get_interview(interview_id)
+    if interview is None:
+        return None
+    return _etag("interview", interview.pk, interview.updated_at.isoformat(), _client_state(request))
+
+
+def interview_last_modified(request, interview_id):
+    if _has_messages(request):
+        return None
+    interview = get_interview(interview_id)
+    return interview.updated_at if interview is not None else None
+
+
+def listing_version(request, name, queryset):
+    """'<newest updated_at>:<count>' of the listed interviews, memoised on the
+    request so the ETag function and the view share one query. Also keys the
+    whole-list template fragments."""
+    versions = request.__dict__.setdefault("_interview_listing_versions", {})
+    if name not in versions:
+        state = queryset.filter(deletion_requested_at__isnull=True).aggregate(
+            latest=Max("updated_at"), count=Count("id")
+        )
+        latest = state["latest"].isoformat() if state["latest"] else ""
+        versions[name] = f"{latest}:{state['count']}"
+    return versions[name]
+
+
+def _listing_etag(name, request, queryset):
+    # ETag only: a deletion changes the count but not the newest timestamp,
+    # so Last-Modified alone would let a stale listing through.
+    if _has_messages(request):
+        return None
+    return _etag(name, listing_version(request, name, queryset), _client_state(request))
+
+
+def hr_dashboard_etag(request):
+    return _listing_etag("hr_dashboard", request, Interview.objects.filter(created_by=request.user))
+
+
+def candidate_dashboard_etag(request):
+    return _listing_etag("candidate_dashboard", request, Interview.objects.all())
+
+
+def candidate_dashboard_version(request):
+    return listing_version(request, "candidate_dashboard", Interview.objects.all())
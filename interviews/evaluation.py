@@ -0,0 +1,94 @@
+"""
+Answer scoring.
+
+By default interview_session scores each answer as it is submitted, with
+one evaluate_answer call. Interviews with ``batch_evaluation`` set store the
+answers unscored and score the whole session once the last answer is in:
+``evaluate_session`` sends every question/answer pair and the interview's
+evaluation criteria in one structured call. The answers' scores and the
+InterviewResult are written through ingest_callback, the same path
+api_callback results take, so the leaderboard, caches and stored payload
+are kept up to date. That is one provider call per session instead of one
+per answer, and the outline is sent once instead of N times.
+
+If the batch call fails, the answers are scored one by one as before, but
+in a background thread once the request's transaction commits, so the last
+POST does not wait on N sequential provider calls.
+"""
+import logging
+import threading
+
+from django.db import connection, transaction
+
+from .ai import evaluate_answer, evaluate_interview
+from .ingest import ingest_callback
+from .models import InterviewAnswer
+
+
+logger = logging.getLogger(__name__)
+
+
+def parse_evaluation(result):
+    """Split evaluate_answer's "Score: <n>\\nFeedback: <text>" reply into (score, feedback)."""
+    score = None
+    feedback = result
+    if "Score:" in result:
+        try:
+            score = int(result.split("Score:")[1].split("\n")[0].strip())
+            feedback = result.split("Feedback:")[1].strip()
+        except (IndexError, ValueError):
+            pass
+    return score, feedback
+
+
+def _evaluate_each(answers):
+    payload_answers = []
+    for a in answers:
+        score, feedback = parse_evaluation(evaluate_answer(a.question, a.answer))
+        payload_answers.append({
+            "question_number": a.question_number, "question": a.question, "answer": a.answer,
+            "ai_score": score, "ai_feedback": feedback,
+        })
+    scores = [a["ai_score"] for a in payload_answers if a["ai_score"] is not None]
+    return {
+        "answers": payload_answers,
+        "overall_score": round(sum(scores) / len(scores) * 10) if scores else None,
+        "overall_feedback": "",
+    }
+
+
+def _session_answers(interview, candidate):
+    return list(
+        InterviewAnswer.objects.filter(interview=interview, candidate=candidate).order_by("question_number")
+    )
+
+
+def _evaluate_each_after_commit(interview, candidate):
+    def run():
+        try:
+            ingest_callback(interview, candidate, _evaluate_each(_session_answers(interview, candidate)))
+        except Exception:
+            logger.exception("Scoring the answers of interview #%s one by one failed", interview.pk)
+        finally:
+            # Not a request thread: close the connection it opened.
+            connection.close()
+
+    def start():
+        threading.Thread(target=run, name="session-evaluation", daemon=True).start()
+    transaction.on_commit(start)
+
+
+def evaluate_session(interview, candidate):
+    """Score all of ``candidate``'s answers to ``interview`` and store the result.
+
+    Returns the InterviewResult, or None when the batch call failed and the
+    answers are being scored in the background.
+    """
+    answers = _session_answers(interview, candidate)
+    payload = evaluate_interview(interview, answers)
+    if payload is None:
+        logger.warning("Batch evaluation of interview #%s failed; scoring answers one by one", interview.pk)
+        _evaluate_each_after_commit(interview, candidate)
+        return None
+    result, _duplicate = ingest_callback(interview, candidate, payload)
+    return result
@@ -0,0 +1,104 @@
+"""
+Streaming exports of answers and results for an HR user's interviews.
+
+Rows are pulled with ``.iterator(chunk_size=...)`` and written out one at a
+time, so memory use stays flat no matter how many rows are exported. Used by
+the ``hr_export`` view (StreamingHttpResponse) and the ``export_results``
+management command (file or stdout).
+
+``InterviewResult.raw_payload`` is never exported: it holds the whole
+callback body, including the callback token.
+"""
+import csv
+import json
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import DEFAULT_DB_ALIAS
+
+from .models import InterviewAnswer, InterviewResult
+
+
+CHUNK_SIZE = 2000
+
+FORMATS = {
+    "csv": "text/csv",
+    "jsonl": "application/x-ndjson",
+}
+
+ANSWER_COLUMNS = [
+    "id", "interview_id", "interview_title", "candidate_id", "candidate_username",
+    "question_number", "question", "answer", "ai_score", "ai_feedback", "created_at",
+]
+
+RESULT_COLUMNS = [
+    "id", "interview_id", "interview_title", "candidate_id", "candidate_username",
+    "overall_score", "overall_feedback", "created_at",
+]
+
+
+def _answer_rows(queryset):
+    for a in queryset:
+        yield [
+            a.id, a.interview_id, a.interview.title, a.candidate_id, a.candidate.username,
+            a.question_number, a.question, a.answer, a.ai_score, a.ai_feedback, a.created_at,
+        ]
+
+
+def _result_rows(queryset):
+    for r in queryset:
+        yield [
+            r.id, r.interview_id, r.interview.title, r.candidate_id, r.candidate.username,
+            r.overall_score, r.overall_feedback, r.created_at,
+        ]
+
+
+def export_rows(user, kind, interview_id=None, using=DEFAULT_DB_ALIAS):
+    """Return (columns, row iterator) for answers or results of ``user``'s interviews."""
+    if kind == "results":
+        qs = InterviewResult.objects.using(using).filter(interview__created_by=user).select_related(
+            "interview", "candidate"
+        ).only(
+            "id", "interview", "interview__title", "candidate", "candidate__username",
+            "overall_score", "overall_feedback", "created_at",
+        )
+        columns, to_rows = RESULT_COLUMNS, _result_rows
+    else:
+        qs = InterviewAnswer.objects.using(using).filter(interview__created_by=user).select_related(
+            "interview", "candidate"
+        ).only(
+            "id", "interview", "interview__title", "candidate", "candidate__username",
+            "question_number", "question", "answer", "ai_score", "ai_feedback", "created_at",
+        )
+        columns, to_rows = ANSWER_COLUMNS, _answer_rows
+
+    qs = qs.filter(interview__deletion_requested_at__isnull=True)
+    if interview_id is not None:
+        qs = qs.filter(interview_id=interview_id)
+    qs = qs.order_by("interview_id", "candidate_id", "id")
+    return columns, to_rows(qs.iterator(chunk_size=CHUNK_SIZE))
+
+
+class _Echo:
+    """File-like object whose write() just hands the line back to csv.writer's caller."""
+
+    def write(self, value):
+        return value
+
+
+def iter_csv(columns, rows):
+    writer = csv.writer(_Echo())
+    yield writer.writerow(columns)
+    for row in rows:
+        yield writer.writerow(row)
+
+
+def iter_jsonl(columns, rows):
+    for row in rows:
+        yield json.dumps(dict(zip(columns, row)), cls=DjangoJSONEncoder) + "\n"
+
+
+def iter_export(user, kind, fmt, interview_id=None, using=DEFAULT_DB_ALIAS):
+    columns, rows = export_rows(user, kind, interview_id, using)
+    if fmt == "jsonl":
+        return iter_jsonl(columns, rows)
+    return iter_csv(columns, rows)
@@ -12,7 +12,13 @@ class InterviewForm(forms.ModelForm):
             "responsibilities",
             "evaluation_criteria",
             "number_of_questions",
+            "plan_questions",
+            "batch_evaluation",
         ]
+        labels = {
+            "plan_questions": "Plan each session up front",
+            "batch_evaluation": "Score all answers at the end",
+        }
         widgets = {
             "description": forms.Textarea(attrs={"rows": 3}),
             "required_skills": forms.Textarea(attrs={"rows": 2}),
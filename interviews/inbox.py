@@ -0,0 +1,117 @@
+"""
+Batch processor for the callback inbox.
+
+With CALLBACK_INBOX on, ``api_callback`` stores each payload as a pending
+CallbackInbox row and answers 202 straight away. ``process_batch`` drains pending rows in arrival
+order: candidates are resolved in one query, then the whole batch is
+ingested with ``ingest_batch``. If the batch fails, each row is retried on
+its own so one bad payload can't block the rest. Failed rows are retried
+with exponential backoff and marked dead after ``max_attempts``.
+"""
+import logging
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.utils import timezone
+
+from .ingest import InvalidPayload, ingest_batch, ingest_callback, validate_payload
+from .models import CallbackInbox
+
+
+logger = logging.getLogger(__name__)
+
+MAX_ATTEMPTS = 5
+BACKOFF_SECONDS = 30
+MAX_BACKOFF_SECONDS = 3600
+
+
+class InboxError(Exception):
+    pass
+
+
+def _backoff(attempts):
+    return timedelta(seconds=min(BACKOFF_SECONDS * 2 ** (attempts - 1), MAX_BACKOFF_SECONDS))
+
+
+def _resolve(items):
+    """Return {item.pk: (interview, candidate, payload, key)}; rows whose
+    candidate can't be resolved map to an InboxError instead."""
+    User = get_user_model()
+    usernames = {item.payload.get('candidate_username') for item in items}
+    users = {u.username: u for u in User.objects.filter(username__in=usernames)}
+    resolved = {}
+    for item in items:
+        candidate = users.get(item.payload.get('candidate_username'))
+        try:
+            validate_payload(item.payload)
+        except InvalidPayload as e:
+            resolved[item.pk] = e
+            continue
+        if candidate is None:
+            resolved[item.pk] = InboxError("candidate_not_found")
+        else:
+            resolved[item.pk] = (item.interview, candidate, item.payload, item.idempotency_key or None)
+    return resolved
+
+
+def _mark_failed(item, error, max_attempts):
+    item.attempts += 1
+    item.last_error = str(error)[:2000]
+    if item.attempts >= max_attempts:
+        item.status = CallbackInbox.STATUS_DEAD
+        logger.error("Callback inbox #%s moved to dead letter after %s attempts: %s", item.pk, item.attempts, error)
+    else:
+        item.available_at = timezone.now() + _backoff(item.attempts)
+        logger.warning("Callback inbox #%s failed (attempt %s): %s", item.pk, item.attempts, error)
+
+
+def _mark_done(item, result):
+    item.status = CallbackInbox.STATUS_DONE
+    item.result = result
+    item.processed_at = timezone.now()
+    item.last_error = ""
+
+
+def process_batch(batch_size=100, max_attempts=MAX_ATTEMPTS):
+    """Process up to ``batch_size`` due inbox rows. Returns (done, failed)."""
+    with transaction.atomic():
+        items = list(
+            CallbackInbox.objects.select_for_update(skip_locked=True)
+            .filter(status=CallbackInbox.STATUS_PENDING, available_at__lte=timezone.now())
+            .select_related('interview')
+            .order_by('id')[:batch_size]
+        )
+        if not items:
+            return 0, 0
+
+        resolved = _resolve(items)
+        ready = [item for item in items if not isinstance(resolved[item.pk], Exception)]
+        for item in items:
+            if isinstance(resolved[item.pk], InvalidPayload):
+                # Retrying can't fix it (rows queued before api_callback validated).
+                _mark_failed(item, resolved[item.pk], max_attempts=1)
+            elif isinstance(resolved[item.pk], Exception):
+                _mark_failed(item, resolved[item.pk], max_attempts)
+
+        try:
+            with transaction.atomic():
+                outcome = ingest_batch([resolved[item.pk] for item in ready])
+            for item, (result, _duplicate) in zip(ready, outcome):
+                _mark_done(item, result)
+        except Exception as e:
+            logger.warning("Callback inbox batch of %s failed (%s); retrying rows one by one", len(ready), e)
+            for item in ready:
+                try:
+                    with transaction.atomic():
+                        result, _duplicate = ingest_callback(*resolved[item.pk])
+                    _mark_done(item, result)
+                except Exception as item_error:
+                    _mark_failed(item, item_error, max_attempts)
+
+        CallbackInbox.objects.bulk_update(
+            items, ['status', 'attempts', 'last_error', 'available_at', 'processed_at', 'result']
+        )
+
+    done = sum(1 for item in items if item.status == CallbackInbox.STATUS_DONE)
+    return done, len(items) - done
@@ -0,0 +1,208 @@
+"""
+Ingestion of evaluation results posted to api_callback.
+
+A callback payload is written in one transaction with a fixed number of
+queries: all answers are upserted with a single ``bulk_create(...,
+update_conflicts=True)`` on (interview, candidate, question_number), and the
+overall result is upserted on (interview, candidate). An optional
+idempotency key is recorded in CallbackReceipt so a retried callback returns
+the original result instead of being applied again. The raw payload is
+stored compressed in ResultPayload (see payloads.py).
+
+``ingest_batch`` does the same for many payloads at once (used by the
+callback inbox processor): one answer upsert, one result upsert, one payload
+upsert and one receipt insert for the whole batch.
+
+``validate_payload`` rejects payloads these writes can't store (a
+non-numeric question number or score), before anything is queued.
+"""
+from django.db import IntegrityError, transaction
+
+from .cache import invalidate_answers
+from .leaderboard import schedule_refresh
+from .models import CallbackReceipt, InterviewAnswer, InterviewResult
+from .payloads import store_payloads
+
+
+ANSWER_UPDATE_FIELDS = ["question", "answer", "ai_score", "ai_feedback"]
+
+
+class InvalidPayload(ValueError):
+    pass
+
+
+def _is_integer(value):
+    if isinstance(value, bool):
+        return False
+    if isinstance(value, int):
+        return True
+    return isinstance(value, str) and value.strip().isdigit()
+
+
+def validate_payload(payload):
+    """Raise InvalidPayload if ``payload`` can't be ingested."""
+    if not isinstance(payload, dict):
+        raise InvalidPayload("payload must be an object")
+    if payload.get('overall_score') is not None and not _is_integer(payload['overall_score']):
+        raise InvalidPayload("overall_score must be an integer")
+    answers = payload.get('answers', [])
+    if not isinstance(answers, list):
+        raise InvalidPayload("answers must be a list")
+    for n, a in enumerate(answers):
+        if not isinstance(a, dict):
+            raise InvalidPayload(f"answers[{n}] must be an object")
+        qnum = a.get('question_number')
+        if qnum is not None and not (_is_integer(qnum) and int(qnum) >= 0):
+            raise InvalidPayload(f"answers[{n}].question_number must be a non-negative integer")
+        if a.get('ai_score') is not None and not _is_integer(a['ai_score']):
+            raise InvalidPayload(f"answers[{n}].ai_score must be an integer")
+
+
+def _answer_objects(interview, candidate, answers):
+    # Keyed by question number so a payload repeating a question keeps the
+    # last entry (Postgres refuses to upsert the same row twice in one statement).
+    by_number = {}
+    for a in answers:
+        qnum = a.get('question_number')
+        if qnum is None:
+            continue
+        by_number[int(qnum)] = InterviewAnswer(
+            interview=interview,
+            candidate=candidate,
+            question_number=int(qnum),
+            question=a.get('question', ''),
+            answer=a.get('answer', ''),
+            ai_score=a.get('ai_score'),
+            ai_feedback=a.get('ai_feedback', ''),
+        )
+    return list(by_number.values())
+
+
+def ingest_callback(interview, candidate, payload, idempotency_key=None):
+    """Store a callback payload. Returns ``(result, duplicate)``.
+
+    ``duplicate`` is True when ``idempotency_key`` was already processed for
+    this interview, in which case nothing is written and the result stored
+    the first time is returned.
+    """
+    if idempotency_key:
+        receipt = CallbackReceipt.objects.filter(
+            interview=interview, key=idempotency_key
+        ).select_related('result').defer('result__raw_payload').first()
+        if receipt is not None:
+            return receipt.result, True
+
+    with transaction.atomic():
+        answers = _answer_objects(interview, candidate, payload.get('answers', []))
+        if answers:
+            InterviewAnswer.objects.bulk_create(
+                answers,
+                batch_size=500,
+                update_conflicts=True,
+                unique_fields=["interview", "candidate", "question_number"],
+                update_fields=ANSWER_UPDATE_FIELDS,
+            )
+            # bulk_create sends no post_save, so drop derived caches by hand.
+            transaction.on_commit(lambda: invalidate_answers(interview.pk))
+            schedule_refresh(interview.pk, candidate.pk)
+
+        result, _ = InterviewResult.objects.update_or_create(
+            interview=interview,
+            candidate=candidate,
+            defaults={
+                'overall_score': payload.get('overall_score'),
+                'overall_feedback': payload.get('overall_feedback', ''),
+                'raw_payload': None,  # superseded by the ResultPayload row
+            },
+        )
+        store_payloads({result.pk: payload})
+
+        if idempotency_key:
+            try:
+                with transaction.atomic():
+                    CallbackReceipt.objects.create(interview=interview, key=idempotency_key, result=result)
+            except IntegrityError:
+                # A concurrent retry with the same key got here first. The
+                # upserts above wrote the same rows, so there is nothing to undo.
+                pass
+
+    return result, False
+
+
+def ingest_batch(entries):
+    """Store several callbacks in one transaction.
+
+    ``entries`` is a list of ``(interview, candidate, payload, idempotency_key)``
+    in arrival order; later payloads win when they touch the same answer or
+    result. Returns a list of ``(result, duplicate)`` in the same order. Any
+    error rolls back the whole batch, so callers can retry entries one by one.
+    """
+    keys = {(interview.pk, key) for interview, _c, _p, key in entries if key}
+    seen = {}
+    if keys:
+        receipts = CallbackReceipt.objects.filter(
+            interview_id__in={i for i, _k in keys}, key__in={k for _i, k in keys}
+        ).select_related('result').defer('result__raw_payload')
+        seen = {(r.interview_id, r.key): r.result for r in receipts}
+
+    answers, results, payloads = {}, {}, {}
+    for interview, candidate, payload, key in entries:
+        if (interview.pk, key) in seen:
+            continue
+        for a in _answer_objects(interview, candidate, payload.get('answers', [])):
+            answers[(interview.pk, candidate.pk, a.question_number)] = a
+        results[(interview.pk, candidate.pk)] = InterviewResult(
+            interview=interview,
+            candidate=candidate,
+            overall_score=payload.get('overall_score'),
+            overall_feedback=payload.get('overall_feedback', ''),
+            raw_payload=None,
+        )
+        payloads[(interview.pk, candidate.pk)] = payload
+
+    with transaction.atomic():
+        if answers:
+            InterviewAnswer.objects.bulk_create(
+                list(answers.values()),
+                batch_size=500,
+                update_conflicts=True,
+                unique_fields=["interview", "candidate", "question_number"],
+                update_fields=ANSWER_UPDATE_FIELDS,
+            )
+            # bulk_create sends no post_save, so drop derived caches by hand.
+            for interview_id in {i for i, _c, _q in answers}:
+                transaction.on_commit(lambda interview_id=interview_id: invalidate_answers(interview_id))
+        if results:
+            InterviewResult.objects.bulk_create(
+                list(results.values()),
+                batch_size=500,
+                update_conflicts=True,
+                unique_fields=["interview", "candidate"],
+                update_fields=["overall_score", "overall_feedback", "raw_payload", "updated_at"],
+            )
+            # Upserted rows don't get their primary keys back on every backend.
+            stored = InterviewResult.objects.filter(
+                interview_id__in={i for i, _c in results},
+                candidate_id__in={c for _i, c in results},
+            ).only('id', 'interview', 'candidate')
+            result_ids = {(r.interview_id, r.candidate_id): r for r in stored}
+            store_payloads({result_ids[pair].pk: payload for pair, payload in payloads.items()})
+            # Also covers every pair touched by the answer upsert above.
+            for interview_id, candidate_id in results:
+                schedule_refresh(interview_id, candidate_id)
+
+        receipts = []
+        outcome = []
+        for interview, candidate, payload, key in entries:
+            if (interview.pk, key) in seen:
+                outcome.append((seen[(interview.pk, key)], True))
+                continue
+            result = result_ids[(interview.pk, candidate.pk)]
+            if key:
+                receipts.append(CallbackReceipt(interview=interview, key=key, result=result))
+                seen[(interview.pk, key)] = result
+            outcome.append((result, False))
+        if receipts:
+            CallbackReceipt.objects.bulk_create(receipts, ignore_conflicts=True)
+
+    return outcome
@@ -0,0 +1,207 @@
+"""
+Per-interview candidate leaderboard.
+
+Each (interview, candidate) pair has one CandidateStanding row holding the
+candidate's answer count, score sum, average answer score and overall
+result score. Rows are refreshed one pair at a time when an answer or result
+changes (signals.py, ingest.py): the refresh aggregates only that
+candidate's answers for that interview, never the whole interview. Changes
+made inside a transaction are collected and refreshed together on commit,
+so bulk writes and cascading deletes cost a few grouped queries.
+
+Top-K lists and "where does this candidate stand" are then range scans over
+the (interview, -score) indexes on CandidateStanding.
+"""
+import threading
+
+from django.db import transaction
+from django.db.models import Count, Q, Sum
+
+from .models import CandidateStanding, InterviewAnswer, InterviewResult
+
+
+ORDERINGS = {
+    "average": "average_score",
+    "overall": "overall_score",
+}
+
+# Keeps ``__in`` lists under SQLite's bound-parameter limit.
+CHUNK_SIZE = 500
+
+_pending = threading.local()
+
+
+def _chunks(items, size=CHUNK_SIZE):
+    items = list(items)
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+def refresh_standings(pairs):
+    """Recompute the standings of the given (interview_id, candidate_id) pairs."""
+    by_interview = {}
+    for interview_id, candidate_id in pairs:
+        by_interview.setdefault(interview_id, set()).add(candidate_id)
+
+    for interview_id, candidate_ids in by_interview.items():
+        for chunk in _chunks(candidate_ids):
+            totals = {
+                row["candidate_id"]: row
+                for row in InterviewAnswer.objects.filter(interview_id=interview_id, candidate_id__in=chunk)
+                .values("candidate_id")
+                .annotate(answered=Count("id"), scored=Count("ai_score"), total=Sum("ai_score"))
+            }
+            overall = dict(
+                InterviewResult.objects.filter(interview_id=interview_id, candidate_id__in=chunk)
+                .values_list("candidate_id", "overall_score")
+            )
+
+            standings = []
+            for candidate_id in chunk:
+                row = totals.get(candidate_id)
+                if row is None and candidate_id not in overall:
+                    continue
+                answered = row["answered"] if row else 0
+                scored = row["scored"] if row else 0
+                score_sum = (row["total"] or 0) if row else 0
+                standings.append(CandidateStanding(
+                    interview_id=interview_id,
+                    candidate_id=candidate_id,
+                    answered_count=answered,
+                    scored_count=scored,
+                    score_sum=score_sum,
+                    average_score=score_sum / scored if scored else None,
+                    overall_score=overall.get(candidate_id),
+                ))
+
+            if standings:
+                CandidateStanding.objects.bulk_create(
+                    standings,
+                    update_conflicts=True,
+                    unique_fields=["interview", "candidate"],
+                    update_fields=[
+                        "answered_count", "scored_count", "score_sum",
+                        "average_score", "overall_score", "updated_at",
+                    ],
+                )
+            # Candidates with neither answers nor a result drop off the board.
+            gone = set(chunk) - {s.candidate_id for s in standings}
+            if gone:
+                CandidateStanding.objects.filter(interview_id=interview_id, candidate_id__in=gone).delete()
+
+
+def _flush_pending():
+    pairs = getattr(_pending, "pairs", None)
+    if pairs:
+        _pending.pairs = set()
+        refresh_standings(pairs)
+
+
+def schedule_refresh(interview_id, candidate_id):
+    """Refresh a standing once the current transaction commits (or now, in
+    autocommit). Pairs scheduled in the same transaction are refreshed together."""
+    if getattr(_pending, "pairs", None) is None:
+        _pending.pairs = set()
+    _pending.pairs.add((interview_id, candidate_id))
+    # Every call registers the callback, so pairs left over from a rolled-back
+    # transaction are still flushed by the next commit; extra calls are no-ops.
+    transaction.on_commit(_flush_pending)
+
+
+def rebuild_standings(interview_id=None):
+    """Recompute standings from scratch, e.g. after restoring data. Returns the row count."""
+    answers = InterviewAnswer.objects.all()
+    results = InterviewResult.objects.all()
+    if interview_id is not None:
+        answers = answers.filter(interview_id=interview_id)
+        results = results.filter(interview_id=interview_id)
+    pairs = set(answers.values_list("interview_id", "candidate_id").distinct())
+    pairs |= set(results.values_list("interview_id", "candidate_id"))
+
+    with transaction.atomic():
+        stale = CandidateStanding.objects.all()
+        if interview_id is not None:
+            stale = stale.filter(interview_id=interview_id)
+        stale.delete()
+        refresh_standings(pairs)
+    return len(pairs)
+
+
+def ranked(interview, by="average"):
+    """Standings of ``interview`` that have a score for ``by``, best first."""
+    field = ORDERINGS[by]
+    return (
+        CandidateStanding.objects.filter(interview=interview, **{f"{field}__isnull": False})
+        .select_related("candidate")
+        .order_by(f"-{field}", "id")
+    )
+
+
+def _positions(queryset, field, values, equal):
+    """Map each score in ``values`` (distinct, best first) to (rank, percentile);
+    returns ``(positions, total)``.
+
+    ``equal`` counts how many rows of the current page share each score; the
+    counts for the first and last score are taken from the database because
+    ties can continue onto neighbouring pages.
+    """
+    top, bottom = values[0], values[-1]
+    counts = queryset.aggregate(
+        total=Count("id"),
+        above=Count("id", filter=Q(**{f"{field}__gt": top})),
+        at_top=Count("id", filter=Q(**{field: top})),
+        at_bottom=Count("id", filter=Q(**{field: bottom})),
+    )
+    equal = dict(equal)
+    equal[top] = counts["at_top"]
+    equal[bottom] = counts["at_bottom"]
+    total = counts["total"]
+
+    positions = {}
+    higher = counts["above"]
+    for value in values:
+        same = equal[value]
+        lower = total - higher - same
+        # Share of the other candidates scoring lower; ties count as half.
+        if total > 1:
+            percentile = round((lower + (same - 1) / 2) / (total - 1) * 100, 1)
+        else:
+            percentile = 100.0
+        positions[value] = (higher + 1, percentile)
+        higher += same
+    return positions, total
+
+
+def annotate_positions(standings, interview, by="average"):
+    """Set ``rank`` and ``percentile`` on a page of standings from ``ranked()``."""
+    field = ORDERINGS[by]
+    standings = list(standings)
+    if not standings:
+        return standings
+    values, equal = [], {}
+    for s in standings:
+        value = getattr(s, field)
+        if value not in equal:
+            values.append(value)
+            equal[value] = 0
+        equal[value] += 1
+
+    queryset = CandidateStanding.objects.filter(interview=interview, **{f"{field}__isnull": False})
+    positions, _total = _positions(queryset, field, values, equal)
+    for s in standings:
+        s.rank, s.percentile = positions[getattr(s, field)]
+    return standings
+
+
+def standing_for(interview, candidate, by="average"):
+    """The candidate's standing with ``rank``, ``percentile`` and ``total`` set,
+    or None if they have no score for ``by`` yet."""
+    field = ORDERINGS[by]
+    standing = CandidateStanding.objects.filter(interview=interview, candidate=candidate).first()
+    if standing is None or getattr(standing, field) is None:
+        return None
+    queryset = CandidateStanding.objects.filter(interview=interview, **{f"{field}__isnull": False})
+    value = getattr(standing, field)
+    positions, standing.total = _positions(queryset, field, [value], {})
+    standing.rank, standing.percentile = positions[value]
+    return standing
@@ -0,0 +1,37 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from interviews.retention import BATCH_SIZE, POLICIES, archive_expired, archive_path, retention_days
+
+
+class Command(BaseCommand):
+    help = "Archive rows older than the retention policy (RETENTION_DAYS) to .jsonl.gz and delete them in batches."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--kind", choices=sorted(POLICIES), action="append",
+                            help="Only apply this policy (repeatable). Defaults to all.")
+        parser.add_argument("--days", type=int, help="Override the configured retention for the selected kinds.")
+        parser.add_argument("--batch-size", type=int, default=BATCH_SIZE)
+        parser.add_argument("--archive-dir", help="Where to write archives (default RETENTION_ARCHIVE_DIR).")
+        parser.add_argument("--no-archive", action="store_true", help="Delete without writing an archive.")
+        parser.add_argument("--dry-run", action="store_true", help="Only report how many rows would be removed.")
+
+    def handle(self, *args, **options):
+        if options["days"] is not None and options["days"] <= 0:
+            raise CommandError("--days must be positive.")
+
+        for kind in options["kind"] or sorted(POLICIES):
+            days = options["days"] or retention_days(kind)
+            if not days:
+                self.stdout.write(f"{kind}: no retention configured, skipped.")
+                continue
+            archive = None
+            if not (options["no_archive"] or options["dry_run"]):
+                archive = archive_path(kind, options["archive_dir"])
+            removed = archive_expired(
+                kind, days, batch_size=options["batch_size"], archive=archive, dry_run=options["dry_run"]
+            )
+            if options["dry_run"]:
+                self.stdout.write(f"{kind}: {removed} row(s) older than {days} days would be removed.")
+            else:
+                where = f" (archived to {archive})" if archive and removed else ""
+                self.stdout.write(self.style.SUCCESS(f"{kind}: removed {removed} row(s) older than {days} days{where}."))
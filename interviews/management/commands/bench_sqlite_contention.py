@@ -0,0 +1,112 @@
+"""
+Contention benchmark for the SQLite settings.
+
+Runs the same write workload twice against a throwaway database file: once
+with stock SQLite behaviour (rollback journal, deferred BEGIN, Django's
+default 5s timeout) and once with the tuned backend settings from
+``config.backends.sqlite3``. Each writer thread mimics an answer submission:
+it reads how many answers the candidate already has, then inserts the next
+one inside the same transaction.
+
+    python config/manage.py bench_sqlite_contention --writers 32 --transactions 100
+"""
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+
+from django.core.management.base import BaseCommand
+
+from config.backends.sqlite3.base import DEFAULT_PRAGMAS, apply_pragmas
+
+
+SCENARIOS = {
+    "baseline": {"pragmas": {"journal_mode": "DELETE"}, "begin": "BEGIN", "timeout": 5.0},
+    "tuned": {"pragmas": DEFAULT_PRAGMAS, "begin": "BEGIN IMMEDIATE", "timeout": 20.0},
+}
+
+
+def _writer(path, scenario, writer_id, transactions, stats, lock):
+    conn = sqlite3.connect(path, timeout=scenario["timeout"], isolation_level=None, check_same_thread=False)
+    apply_pragmas(conn, scenario["pragmas"])
+    ok = locked = 0
+    for i in range(transactions):
+        try:
+            conn.execute(scenario["begin"])
+            (answered,) = conn.execute(
+                "SELECT COUNT(*) FROM answers WHERE candidate_id = ?", (writer_id,)
+            ).fetchone()
+            conn.execute(
+                "INSERT INTO answers (candidate_id, question_number, answer) VALUES (?, ?, ?)",
+                (writer_id, answered + 1, "x" * 400),
+            )
+            conn.execute("COMMIT")
+            ok += 1
+        except sqlite3.OperationalError as e:
+            if "locked" not in str(e) and "busy" not in str(e):
+                raise
+            locked += 1
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+    conn.close()
+    with lock:
+        stats["ok"] += ok
+        stats["locked"] += locked
+
+
+def run_scenario(name, writers, transactions):
+    scenario = SCENARIOS[name]
+    fd, path = tempfile.mkstemp(suffix=".sqlite3")
+    os.close(fd)
+    try:
+        setup = sqlite3.connect(path, isolation_level=None)
+        apply_pragmas(setup, scenario["pragmas"])
+        setup.execute(
+            "CREATE TABLE answers (id INTEGER PRIMARY KEY, candidate_id INTEGER, "
+            "question_number INTEGER, answer TEXT)"
+        )
+        setup.execute("CREATE INDEX answers_candidate ON answers (candidate_id)")
+        setup.close()
+
+        stats = {"ok": 0, "locked": 0}
+        lock = threading.Lock()
+        threads = [
+            threading.Thread(target=_writer, args=(path, scenario, w, transactions, stats, lock))
+            for w in range(writers)
+        ]
+        started = time.perf_counter()
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        stats["elapsed"] = time.perf_counter() - started
+        return stats
+    finally:
+        for suffix in ("", "-wal", "-shm", "-journal"):
+            if os.path.exists(path + suffix):
+                os.remove(path + suffix)
+
+
+class Command(BaseCommand):
+    help = "Measure the 'database is locked' error rate with N concurrent SQLite writers, before and after tuning."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--writers", type=int, default=32)
+        parser.add_argument("--transactions", type=int, default=100, help="Transactions per writer.")
+        parser.add_argument("--scenario", choices=sorted(SCENARIOS), action="append",
+                            help="Run only the given scenario (repeatable). Defaults to all.")
+
+    def handle(self, *args, **options):
+        writers = options["writers"]
+        transactions = options["transactions"]
+        total = writers * transactions
+        self.stdout.write(f"{writers} writers x {transactions} transactions = {total} attempts per scenario")
+        self.stdout.write(f"{'scenario':<10} {'committed':>10} {'locked':>8} {'error %':>8} {'tx/s':>9}")
+        for name in options["scenario"] or SCENARIOS:
+            stats = run_scenario(name, writers, transactions)
+            rate = 100.0 * stats["locked"] / total
+            throughput = stats["ok"] / stats["elapsed"] if stats["elapsed"] else 0
+            self.stdout.write(
+                f"{name:<10} {stats['ok']:>10} {stats['locked']:>8} {rate:>7.1f}% {throughput:>9.0f}"
+            )
@@ -0,0 +1,95 @@
+"""
+Render-time benchmark for the row fragment cache.
+
+Renders hr_results.html and candidate_dashboard.html over ``--rows``
+synthetic rows (no database) three ways: with the fragment cache disabled
+(DummyCache, the development default), with an empty cache (first request
+after a deploy) and with a warm cache (every later request). hr_results
+caches row by row; candidate_dashboard also caches the whole list under the
+listing version, so a warm render skips the loop entirely.
+
+    python config/manage.py bench_template_render --rows 10000
+"""
+import time
+from datetime import timedelta
+from types import SimpleNamespace
+
+from django.contrib.auth.models import AnonymousUser
+from django.core.cache import caches
+from django.core.management.base import BaseCommand
+from django.template.loader import get_template
+from django.test import RequestFactory
+from django.test.utils import override_settings
+from django.utils import timezone
+
+
+DUMMY = {"BACKEND": "django.core.cache.backends.dummy.DummyCache"}
+LOCMEM = {
+    "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+    "LOCATION": "bench-fragments",
+    "OPTIONS": {"MAX_ENTRIES": 1_000_000},
+}
+
+
+def _rows(count):
+    now = timezone.now()
+    interviews = [
+        SimpleNamespace(
+            id=i, title=f"Backend engineer #{i}", required_skills="Python, Django, SQL, caching " * 4,
+            number_of_questions=5, created_at=now - timedelta(days=i % 300), updated_at=now,
+        )
+        for i in range(1, 51)
+    ]
+    results = [
+        SimpleNamespace(
+            id=n, interview=interviews[n % 50], candidate=SimpleNamespace(id=n, username=f"candidate{n}"),
+            overall_score=n % 100, overall_feedback="Solid answers with room to grow. " * 6,
+            created_at=now - timedelta(minutes=n), updated_at=now,
+        )
+        for n in range(1, count + 1)
+    ]
+    dashboard = [
+        SimpleNamespace(
+            id=n, title=f"Interview {n}", required_skills="Python, Django, SQL, caching " * 4,
+            number_of_questions=5, created_at=now, updated_at=now,
+        )
+        for n in range(1, count + 1)
+    ]
+    return results, dashboard
+
+
+class Command(BaseCommand):
+    help = "Benchmark rendering of the results and dashboard templates with and without fragment caching."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rows", type=int, default=10000)
+        parser.add_argument("--repeat", type=int, default=3, help="Warm renders to average.")
+
+    def _render(self, template, context, request):
+        start = time.perf_counter()
+        template.render(context, request)
+        return time.perf_counter() - start
+
+    def handle(self, *args, **options):
+        request = RequestFactory().get("/")
+        request.user = AnonymousUser()
+        results, dashboard = _rows(options["rows"])
+        pages = [
+            ("hr_results", get_template("interviews/hr_results.html"), {"results": results}),
+            ("candidate_dashboard", get_template("accounts/candidate_dashboard.html"),
+             {"interviews": dashboard, "interviews_version": f"bench:{len(dashboard)}"}),
+        ]
+        self.stdout.write(f"{options['rows']} rows per page\n")
+
+        for name, template, context in pages:
+            with override_settings(CACHES={"default": LOCMEM, "fragments": DUMMY}):
+                uncached = min(self._render(template, context, request) for _ in range(options["repeat"]))
+            with override_settings(CACHES={"default": LOCMEM, "fragments": LOCMEM}):
+                caches["fragments"].clear()
+                cold = self._render(template, context, request)
+                warm = min(self._render(template, context, request) for _ in range(options["repeat"]))
+                caches["fragments"].clear()
+            self.stdout.write(
+                f"{name:<20} uncached {uncached * 1000:8.1f} ms   cold {cold * 1000:8.1f} ms   "
+                f"warm {warm * 1000:8.1f} ms   ({uncached / warm:.1f}x)"
+            )
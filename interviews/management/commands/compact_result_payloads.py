@@ -0,0 +1,35 @@
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+
+from interviews.models import InterviewResult
+from interviews.payloads import store_payloads
+
+
+class Command(BaseCommand):
+    help = "Move InterviewResult.raw_payload into the compressed ResultPayload table, in batches."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=500)
+        parser.add_argument("--vacuum", action="store_true", help="Run VACUUM afterwards (SQLite) to return the freed space.")
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+        pending = InterviewResult.objects.filter(raw_payload__isnull=False).order_by("id")
+        moved = 0
+        last_id = 0
+        while True:
+            batch = list(pending.filter(id__gt=last_id).values_list("id", "raw_payload")[:batch_size])
+            if not batch:
+                break
+            with transaction.atomic():
+                # A ResultPayload row that already exists came from a newer callback; keep it.
+                store_payloads(dict(batch), update=False)
+                InterviewResult.objects.filter(id__in=[pk for pk, _p in batch]).update(raw_payload=None)
+            moved += len(batch)
+            last_id = batch[-1][0]
+            self.stdout.write(f"Compacted {moved} payload(s)...")
+
+        if options["vacuum"] and connection.vendor == "sqlite":
+            with connection.cursor() as cursor:
+                cursor.execute("VACUUM")
+        self.stdout.write(self.style.SUCCESS(f"Moved {moved} raw payload(s) to ResultPayload."))
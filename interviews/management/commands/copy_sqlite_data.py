@@ -0,0 +1,130 @@
+"""
+Copy every row from an existing SQLite file into the configured database.
+
+Meant for moving a deployment from db.sqlite3 to PostgreSQL:
+
+    DATABASE_URL=postgres://... python config/manage.py migrate
+    DATABASE_URL=postgres://... python config/manage.py copy_sqlite_data --source db.sqlite3
+
+Both databases must be migrated to the same state. Rows keep their primary
+keys, are copied model by model in foreign-key order (every table after the
+tables it references) and in batches of
+``--batch-size`` (one transaction per batch), and sequences are reset at
+the end so new inserts don't collide with copied ids.
+"""
+from pathlib import Path
+
+from django.apps import apps
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.core.management.color import no_style
+from django.db import DEFAULT_DB_ALIAS, connections, transaction
+
+
+SOURCE_ALIAS = "sqlite_source"
+
+# Rows that `migrate` creates on its own. Their ids differ between databases,
+# so the target's copies are replaced by the source's.
+AUTO_POPULATED = ("contenttypes.contenttype", "auth.permission")
+
+
+class Command(BaseCommand):
+    help = "Copy all data from a SQLite database file into the default database in batches."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--source", default=str(settings.BASE_DIR / "db.sqlite3"),
+                            help="Path of the SQLite file to copy from.")
+        parser.add_argument("--database", default=DEFAULT_DB_ALIAS,
+                            help="Target database alias.")
+        parser.add_argument("--batch-size", type=int, default=2000)
+        parser.add_argument("--flush", action="store_true",
+                            help="Delete existing rows in the target tables before copying.")
+
+    def handle(self, *args, **options):
+        source = Path(options["source"])
+        if not source.exists():
+            raise CommandError(f"SQLite file {source} does not exist.")
+        target = options["database"]
+        batch_size = options["batch_size"]
+
+        # configure_settings() fills in the defaults Django expects for an alias;
+        # it insists on a 'default' entry, which is discarded here.
+        configured = connections.configure_settings({
+            DEFAULT_DB_ALIAS: {},
+            SOURCE_ALIAS: {"ENGINE": "django.db.backends.sqlite3", "NAME": str(source)},
+        })
+        connections.databases[SOURCE_ALIAS] = configured[SOURCE_ALIAS]
+        if connections[target].vendor == "sqlite" and \
+                Path(connections[target].settings_dict["NAME"]).resolve() == source.resolve():
+            raise CommandError("Source and target are the same SQLite file.")
+
+        models = self._models()
+        self._prepare_target(models, target, options["flush"])
+
+        for model in models:
+            copied = self._copy_model(model, target, batch_size)
+            self.stdout.write(f"{model._meta.label}: {copied} rows")
+
+        with connections[target].cursor() as cursor:
+            for sql in connections[target].ops.sequence_reset_sql(no_style(), models):
+                cursor.execute(sql)
+
+        connections[SOURCE_ALIAS].close()
+        self.stdout.write(self.style.SUCCESS(f"Copied {len(models)} tables from {source}."))
+
+    def _models(self):
+        """Concrete models, each after the models its foreign keys point to."""
+        models = [
+            m for m in apps.get_models(include_auto_created=True)  # includes M2M tables
+            if m._meta.managed and not m._meta.proxy
+        ]
+        targets = {
+            model: {
+                field.related_model._meta.concrete_model
+                for field in model._meta.concrete_fields
+                if field.is_relation and field.related_model._meta.concrete_model is not model
+            }
+            for model in models
+        }
+        ordered, done = [], set()
+        while len(ordered) < len(models):
+            ready = [m for m in models if m not in done and targets[m] <= done | (targets[m] - set(models))]
+            if not ready:
+                # A foreign-key cycle: copy the rest in their original order.
+                ready = [m for m in models if m not in done]
+                self.stderr.write("Foreign-key cycle between: " + ", ".join(m._meta.label for m in ready))
+            for model in ready:
+                ordered.append(model)
+                done.add(model)
+        return ordered
+
+    def _prepare_target(self, models, target, flush):
+        non_empty = [
+            m for m in models
+            if m._meta.label_lower not in AUTO_POPULATED and m._default_manager.using(target).exists()
+        ]
+        if non_empty and not flush:
+            names = ", ".join(m._meta.label for m in non_empty)
+            raise CommandError(f"Target tables are not empty ({names}). Re-run with --flush to overwrite.")
+
+        with transaction.atomic(using=target):
+            for model in reversed(models):
+                if flush or model._meta.label_lower in AUTO_POPULATED:
+                    model._base_manager.using(target).all()._raw_delete(target)
+
+    def _copy_model(self, model, target, batch_size):
+        rows = model._base_manager.using(SOURCE_ALIAS).order_by("pk").iterator(chunk_size=batch_size)
+        batch, copied = [], 0
+        for obj in rows:
+            batch.append(obj)
+            if len(batch) >= batch_size:
+                copied += self._flush_batch(model, batch, target)
+                batch = []
+        if batch:
+            copied += self._flush_batch(model, batch, target)
+        return copied
+
+    def _flush_batch(self, model, batch, target):
+        with transaction.atomic(using=target):
+            model._base_manager.using(target).bulk_create(batch, batch_size=len(batch))
+        return len(batch)
@@ -0,0 +1,31 @@
+import sys
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+
+from interviews.export import FORMATS, iter_export
+
+
+class Command(BaseCommand):
+    help = "Stream all answers or results of an HR user's interviews to a CSV or JSONL file."
+
+    def add_arguments(self, parser):
+        parser.add_argument("username", help="HR user whose interviews are exported.")
+        parser.add_argument("--kind", choices=["answers", "results"], default="answers")
+        parser.add_argument("--format", choices=sorted(FORMATS), default="csv")
+        parser.add_argument("--interview", type=int, help="Only export this interview id.")
+        parser.add_argument("--output", "-o", help="File to write to. Defaults to stdout.")
+
+    def handle(self, *args, **options):
+        User = get_user_model()
+        try:
+            user = User.objects.get(username=options["username"])
+        except User.DoesNotExist:
+            raise CommandError(f"User {options['username']!r} does not exist.")
+
+        chunks = iter_export(user, options["kind"], options["format"], options["interview"])
+        if options["output"]:
+            with open(options["output"], "w", newline="", encoding="utf-8") as fh:
+                fh.writelines(chunks)
+        else:
+            sys.stdout.writelines(chunks)
@@ -0,0 +1,118 @@
+"""
+Fill the database with synthetic users, interviews and answers for scale
+testing (see interviews/synthetic.py for the data model).
+
+    python config/manage.py generate_synthetic_data --hr-users 1000 --interviews 10000 \\
+        --candidates 500000 --answers 5000000 --workers 4
+
+``--answers`` is a target: the session count is sized from the expected
+answers per session, so the final count lands close to it. Every
+incomplete session also stores the question left on screen, so there are
+slightly more AskedQuestion rows than answers. The same ``--seed`` always
+produces the same data, whatever ``--workers`` is. Workers help most on
+PostgreSQL. SQLite serialises writers, although the WAL backend
+(config/backends/sqlite3) keeps them from failing. Workers are forked, so
+they inherit the configured Django app registry; ``--workers`` above 1 is
+not available where fork is not (Windows).
+"""
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+
+from interviews import synthetic
+from interviews.leaderboard import rebuild_standings
+
+
+_worker_args = {}
+
+
+def _init_worker(interviews, candidate_ids, options):
+    # Forked workers must not share the parent's database connection.
+    connections.close_all()
+    _worker_args.update(interviews=interviews, candidate_ids=candidate_ids, options=options)
+
+
+def _run_chunk(start, end):
+    options = _worker_args["options"]
+    return synthetic.generate_sessions(
+        start, end, options["seed"], _worker_args["interviews"], _worker_args["candidate_ids"],
+        options["result_rate"], options["batch_size"],
+    )
+
+
+class Command(BaseCommand):
+    help = "Bulk-generate deterministic synthetic HR users, interviews, candidates, answers and results."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--hr-users", type=int, default=10)
+        parser.add_argument("--interviews", type=int, default=100)
+        parser.add_argument("--candidates", type=int, default=1000)
+        parser.add_argument("--answers", type=int, default=20000, help="Approximate number of answers.")
+        parser.add_argument("--result-rate", type=float, default=0.5,
+                            help="Share of completed sessions that get an InterviewResult.")
+        parser.add_argument("--seed", type=int, default=1)
+        parser.add_argument("--prefix", default="synthetic", help="Username prefix of the generated users.")
+        parser.add_argument("--batch-size", type=int, default=5000)
+        parser.add_argument("--workers", type=int, default=1, help="Processes generating sessions in parallel.")
+        parser.add_argument("--no-standings", action="store_true", help="Skip rebuilding the leaderboard.")
+        parser.add_argument("--no-analyze", action="store_true", help="Skip ANALYZE after loading.")
+
+    def handle(self, *args, **options):
+        if min(options["hr_users"], options["interviews"], options["candidates"]) < 1:
+            raise CommandError("--hr-users, --interviews and --candidates must be at least 1.")
+        if options["workers"] > 1 and "fork" not in multiprocessing.get_all_start_methods():
+            raise CommandError("--workers above 1 needs the fork start method, which this platform lacks.")
+        if User.objects.filter(username__startswith=f"{options['prefix']}-").exists():
+            raise CommandError(f"Users named {options['prefix']}-* already exist; pick another --prefix.")
+        started = time.perf_counter()
+
+        hr_ids, candidate_ids = synthetic.create_people(
+            options["prefix"], options["hr_users"], options["candidates"], options["batch_size"], options["seed"],
+        )
+        self.stdout.write(f"{len(hr_ids)} HR users, {len(candidate_ids)} candidates")
+        interviews = synthetic.create_interviews(hr_ids, options["interviews"], options["batch_size"], options["seed"])
+        self.stdout.write(f"{len(interviews)} interviews")
+
+        sessions = round(options["answers"] / synthetic.expected_answers_per_session(interviews))
+        if sessions > len(interviews) * len(candidate_ids):
+            raise CommandError(
+                f"{options['answers']} answers need {sessions} sessions, more than there are "
+                f"(interview, candidate) pairs; add candidates or interviews."
+            )
+        chunks = [
+            (start, min(sessions, start + synthetic.CHUNK_SESSIONS))
+            for start in range(0, sessions, synthetic.CHUNK_SESSIONS)
+        ]
+        totals = [0, 0, 0]
+        if options["workers"] > 1:
+            connections.close_all()
+            with ProcessPoolExecutor(
+                options["workers"], mp_context=multiprocessing.get_context("fork"),
+                initializer=_init_worker, initargs=(interviews, candidate_ids, options),
+            ) as pool:
+                futures = [pool.submit(_run_chunk, start, end) for start, end in chunks]
+                for done, future in enumerate(as_completed(futures), 1):
+                    self._progress(totals, future.result(), done, len(chunks))
+        else:
+            _worker_args.update(interviews=interviews, candidate_ids=candidate_ids, options=options)
+            for done, (start, end) in enumerate(chunks, 1):
+                self._progress(totals, _run_chunk(start, end), done, len(chunks))
+
+        if not options["no_standings"]:
+            self.stdout.write(f"Rebuilt {rebuild_standings()} leaderboard standings")
+        if not options["no_analyze"]:
+            synthetic.analyze()
+        self.stdout.write(self.style.SUCCESS(
+            f"{sessions} sessions: {totals[0]} answers, {totals[1]} asked questions, {totals[2]} results "
+            f"in {time.perf_counter() - started:.1f}s"
+        ))
+
+    def _progress(self, totals, counts, done, chunks):
+        for i, n in enumerate(counts):
+            totals[i] += n
+        if done == chunks or done % 10 == 0:
+            self.stdout.write(f"  {done}/{chunks} chunks, {totals[0]} answers")
@@ -0,0 +1,32 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from interviews.inbox import MAX_ATTEMPTS, process_batch
+
+
+class Command(BaseCommand):
+    help = "Ingest pending api_callback payloads from the callback inbox in batches."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=100)
+        parser.add_argument("--max-attempts", type=int, default=MAX_ATTEMPTS,
+                            help="Failures before a payload is moved to the dead letter state.")
+        parser.add_argument("--loop", action="store_true",
+                            help="Keep polling instead of exiting once the inbox is empty.")
+        parser.add_argument("--sleep", type=float, default=2.0,
+                            help="Seconds to wait between polls of an empty inbox with --loop.")
+
+    def handle(self, *args, **options):
+        total_done = total_failed = 0
+        while True:
+            done, failed = process_batch(options["batch_size"], options["max_attempts"])
+            total_done += done
+            total_failed += failed
+            if done or failed:
+                self.stdout.write(f"processed {done}, failed {failed}")
+                continue
+            if not options["loop"]:
+                break
+            time.sleep(options["sleep"])
+        self.stdout.write(self.style.SUCCESS(f"Inbox drained: {total_done} processed, {total_failed} failed."))
@@ -0,0 +1,28 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from interviews.retention import BATCH_SIZE, delete_interview_in_batches, pending_deletions
+
+
+class Command(BaseCommand):
+    help = "Delete interviews queued for deletion, removing their rows in batches."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=BATCH_SIZE)
+        parser.add_argument("--loop", action="store_true",
+                            help="Keep polling instead of exiting once the queue is empty.")
+        parser.add_argument("--sleep", type=float, default=30.0,
+                            help="Seconds to wait between polls of an empty queue with --loop.")
+
+    def handle(self, *args, **options):
+        while True:
+            interview = pending_deletions().first()
+            if interview is not None:
+                pk = interview.pk
+                delete_interview_in_batches(interview, options["batch_size"])
+                self.stdout.write(f"deleted interview #{pk} ({interview.title})")
+                continue
+            if not options["loop"]:
+                break
+            time.sleep(options["sleep"])
@@ -0,0 +1,96 @@
+"""
+Import-time profile of a cold start.
+
+Starts a fresh interpreter with ``-X importtime`` and does what the first
+request to ``api/index.py`` does: set up Django, build the WSGI handler and
+load the URLconf (which imports every view module). The per-module timings
+Python writes to stderr are then summed by top-level package, so the report
+shows which dependency a cold start is paying for.
+
+    python config/manage.py profile_startup --top 20
+    python config/manage.py profile_startup --with-ai   # include the first model call's SDK import
+"""
+import os
+import subprocess
+import sys
+from collections import defaultdict
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+
+STARTUP = """
+import os, sys, time
+start = time.perf_counter()
+sys.path.insert(0, {root!r})
+os.environ["DJANGO_SETTINGS_MODULE"] = {settings!r}
+from django.core.wsgi import get_wsgi_application
+application = get_wsgi_application()
+from django.urls import get_resolver
+get_resolver().url_patterns
+ready = time.perf_counter()
+if {with_ai!r}:
+    from interviews.ai import _model
+    _model()
+print(f"{{(ready - start) * 1000:.1f}} {{(time.perf_counter() - start) * 1000:.1f}}")
+"""
+
+
+def _parse(stderr):
+    """[(module, self_us, cumulative_us, depth)] from ``-X importtime`` output."""
+    modules = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|", 2)
+        if not self_us.strip().isdigit():
+            continue  # header
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        modules.append((name.strip(), int(self_us), int(cumulative_us), depth))
+    return modules
+
+
+class Command(BaseCommand):
+    help = "Report import time of a cold start (Django setup plus URLconf), grouped by package."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--settings-module", default=os.environ.get("DJANGO_SETTINGS_MODULE", "config.settings"))
+        parser.add_argument("--top", type=int, default=15, help="Rows per table.")
+        parser.add_argument("--with-ai", action="store_true", help="Also import the AI SDK, as the first model call does.")
+
+    def handle(self, *args, **options):
+        code = STARTUP.format(
+            root=str(settings.BASE_DIR), settings=options["settings_module"], with_ai=options["with_ai"],
+        )
+        proc = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", code],
+            capture_output=True, text=True, cwd=settings.BASE_DIR,
+        )
+        if proc.returncode != 0:
+            self.stderr.write(proc.stderr[-2000:])
+            return
+        ready_ms, total_ms = proc.stdout.split()[-2:]
+        modules = _parse(proc.stderr)
+
+        by_package = defaultdict(lambda: [0, 0])
+        for name, self_us, _cumulative, _depth in modules:
+            entry = by_package[name.split(".")[0]]
+            entry[0] += self_us
+            entry[1] += 1
+        imported_us = sum(m[1] for m in modules)
+
+        self.stdout.write(f"Startup to first request: {ready_ms} ms (settings {options['settings_module']})")
+        if options["with_ai"]:
+            self.stdout.write(f"Including AI SDK:         {total_ms} ms")
+        self.stdout.write(f"Modules imported: {len(modules)}, import time {imported_us / 1000:.1f} ms\n")
+
+        self.stdout.write(f"{'package':<32}{'modules':>8}{'self ms':>10}{'share':>8}")
+        ranked = sorted(by_package.items(), key=lambda item: item[1][0], reverse=True)
+        for package, (self_us, count) in ranked[:options["top"]]:
+            share = self_us / imported_us * 100 if imported_us else 0
+            self.stdout.write(f"{package:<32}{count:>8}{self_us / 1000:>10.1f}{share:>7.1f}%")
+
+        self.stdout.write(f"\n{'slowest top-level imports':<48}{'cumulative ms':>14}")
+        roots = [m for m in modules if m[3] == 0]
+        for name, _self, cumulative_us, _depth in sorted(roots, key=lambda m: m[2], reverse=True)[:options["top"]]:
+            self.stdout.write(f"{name:<48}{cumulative_us / 1000:>14.1f}")
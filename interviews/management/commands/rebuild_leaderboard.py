@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from interviews.leaderboard import rebuild_standings
+
+
+class Command(BaseCommand):
+    help = "Recompute candidate standings from answers and results (normally kept up to date incrementally)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--interview", type=int, help="Only rebuild this interview's leaderboard.")
+
+    def handle(self, *args, **options):
+        count = rebuild_standings(options["interview"])
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt {count} standing(s)."))
@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+from django.db import DEFAULT_DB_ALIAS, connections
+
+from interviews.search import install_search_index, rebuild_search_index
+
+
+class Command(BaseCommand):
+    help = "Recreate the full-text search index and re-index every answer and interview."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--database", default=DEFAULT_DB_ALIAS)
+
+    def handle(self, *args, **options):
+        connection = connections[options["database"]]
+        install_search_index(connection)
+        rebuild_search_index(connection)
+        self.stdout.write(self.style.SUCCESS(f"Search index rebuilt on {connection.vendor}."))
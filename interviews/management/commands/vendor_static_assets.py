@@ -0,0 +1,56 @@
+import base64
+import hashlib
+import os
+import urllib.request
+
+from django.apps import apps
+from django.core.management.base import BaseCommand, CommandError
+
+from interviews.assets import VENDOR_ASSETS, VENDOR_INTEGRITY, VENDOR_SUPPORT_FILES
+
+
+def sri_hash(data):
+    return "sha384-" + base64.b64encode(hashlib.sha384(data).digest()).decode()
+
+
+class Command(BaseCommand):
+    help = "Download the pinned Bootstrap files into interviews/static/vendor/ (run before collectstatic)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--force", action="store_true", help="Download again even if the file exists.")
+        parser.add_argument("--timeout", type=float, default=30.0)
+
+    def handle(self, *args, **options):
+        files = {path: url for path, url in VENDOR_ASSETS.values()}
+        files.update(VENDOR_SUPPORT_FILES)
+        static_dir = os.path.join(apps.get_app_config("interviews").path, "static")
+
+        for path, url in files.items():
+            target = os.path.join(static_dir, path)
+            if os.path.exists(target) and not options["force"]:
+                with open(target, "rb") as f:
+                    self._verify(path, f.read(), target)
+                self.stdout.write(f"exists  {path}")
+                continue
+            try:
+                with urllib.request.urlopen(url, timeout=options["timeout"]) as response:
+                    data = response.read()
+            except OSError as e:
+                raise CommandError(f"Could not download {url}: {e}")
+            self._verify(path, data)
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            with open(target, "wb") as f:
+                f.write(data)
+            self.stdout.write(f"fetched {path} ({len(data)} bytes, {sri_hash(data)})")
+
+        self.stdout.write(self.style.SUCCESS(f"{len(files)} vendored file(s) in {static_dir}."))
+
+    def _verify(self, path, data, stored=None):
+        digest = sri_hash(data)
+        pinned = VENDOR_INTEGRITY.get(path)
+        if pinned is None:
+            raise CommandError(f"{path} has no pinned hash; add {digest!r} to VENDOR_INTEGRITY after checking it.")
+        if digest != pinned:
+            if stored:
+                os.remove(stored)
+            raise CommandError(f"{path} does not match its pinned hash: expected {pinned}, got {digest}.")
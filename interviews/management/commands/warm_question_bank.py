@@ -0,0 +1,51 @@
+"""
+Pre-generate questions for interviews (see interviews/question_bank.py).
+
+    python config/manage.py warm_question_bank --workers 8 --rate 120
+
+Without ``--interview`` every interview that isn't queued for deletion is
+warmed. Banks that are already full cost one query each, so the command can
+be re-run (or interrupted and re-run) at any time.
+"""
+from django.core.management.base import BaseCommand, CommandError
+
+from interviews.models import Interview
+from interviews.question_bank import bank_size, clear_bank, warm_up
+
+
+class Command(BaseCommand):
+    help = "Fill the question bank of each interview with distinct pre-generated questions."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--interview", type=int, action="append", dest="interviews",
+                            help="Interview id to warm (repeatable). Default: all interviews.")
+        parser.add_argument("--size", type=int, default=None,
+                            help="Questions per interview. Default: QUESTION_BANK_SIZE.")
+        parser.add_argument("--workers", type=int, default=4, help="Interviews generated concurrently.")
+        parser.add_argument("--rate", type=int, default=None,
+                            help="Model requests per minute across all workers. "
+                                 "Default: QUESTION_BANK_RATE_PER_MINUTE; 0 disables the limit.")
+        parser.add_argument("--refresh", action="store_true", help="Discard the existing banks first.")
+
+    def handle(self, *args, **options):
+        if options["workers"] < 1:
+            raise CommandError("--workers must be at least 1.")
+        interviews = Interview.objects.filter(deletion_requested_at__isnull=True).order_by("id")
+        if options["interviews"]:
+            interviews = interviews.filter(id__in=options["interviews"])
+        interviews = list(interviews)
+        if options["refresh"]:
+            for interview in interviews:
+                clear_bank(interview)
+
+        size = options["size"] or bank_size()
+        self.stdout.write(f"Warming {len(interviews)} interview(s) to {size} questions each")
+
+        def report(interview, added, error):
+            if error is not None:
+                self.stderr.write(f"  interview #{interview.pk}: failed after {added} question(s): {error}")
+            elif added:
+                self.stdout.write(f"  interview #{interview.pk}: +{added}")
+
+        total = warm_up(interviews, size=size, workers=options["workers"], per_minute=options["rate"], on_done=report)
+        self.stdout.write(self.style.SUCCESS(f"Added {total} question(s)"))
@@ -0,0 +1,25 @@
+from django.db import migrations
+
+
+def install(apps, schema_editor):
+    from interviews.search import install_search_index, rebuild_search_index
+
+    install_search_index(schema_editor.connection)
+    rebuild_search_index(schema_editor.connection)
+
+
+def uninstall(apps, schema_editor):
+    from interviews.search import drop_search_index
+
+    drop_search_index(schema_editor.connection)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('interviews', '0008_askedquestion'),
+    ]
+
+    operations = [
+        migrations.RunPython(install, uninstall),
+    ]
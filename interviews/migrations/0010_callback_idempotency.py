@@ -0,0 +1,101 @@
+# Generated by Django 4.2.7 on 2026-10-19 15:37
+
+import gzip
+import json
+import os
+
+import django.db.models.deletion
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import migrations, models
+from django.db.models import Count, Max
+from django.utils import timezone
+
+
+def renumber_duplicate_answers(db, InterviewAnswer):
+    """Move all but the newest answer of a repeated question number after the
+    candidate's last one, so no answer is lost."""
+    dupes = InterviewAnswer.objects.using(db).values("interview_id", "candidate_id", "question_number").annotate(
+        keep=Max("id"), n=Count("id")
+    ).filter(n__gt=1)
+    next_number = {}
+    for row in dupes:
+        session = (row["interview_id"], row["candidate_id"])
+        if session not in next_number:
+            last = InterviewAnswer.objects.using(db).filter(
+                interview_id=session[0], candidate_id=session[1]
+            ).aggregate(last=Max("question_number"))["last"]
+            next_number[session] = last + 1
+        moved = InterviewAnswer.objects.using(db).filter(
+            interview_id=session[0], candidate_id=session[1], question_number=row["question_number"]
+        ).exclude(id=row["keep"]).order_by("id")
+        for answer in moved:
+            answer.question_number = next_number[session]
+            answer.save(update_fields=["question_number"])
+            next_number[session] += 1
+    if next_number:
+        print(f"\n  Renumbered repeated answers of {len(next_number)} session(s).")
+
+
+def archive_duplicate_results(db, InterviewResult):
+    """Keep the newest result per candidate; older ones are archived to
+    RETENTION_ARCHIVE_DIR (gzip JSONL, like apply_retention) before deletion."""
+    dupes = InterviewResult.objects.using(db).values("interview_id", "candidate_id").annotate(
+        keep=Max("id"), n=Count("id")
+    ).filter(n__gt=1)
+    older = [
+        row
+        for dupe in dupes
+        for row in InterviewResult.objects.using(db).filter(
+            interview_id=dupe["interview_id"], candidate_id=dupe["candidate_id"]
+        ).exclude(id=dupe["keep"]).values()
+    ]
+    if not older:
+        return
+    archive_dir = getattr(settings, "RETENTION_ARCHIVE_DIR", "archive")
+    os.makedirs(archive_dir, exist_ok=True)
+    path = os.path.join(archive_dir, f"duplicate-results-{timezone.now():%Y%m%dT%H%M%S}.jsonl.gz")
+    with gzip.open(path, "wt", encoding="utf-8") as archive:
+        for row in older:
+            archive.write(json.dumps(row, cls=DjangoJSONEncoder) + "\n")
+    InterviewResult.objects.using(db).filter(id__in=[row["id"] for row in older]).delete()
+    print(f"\n  Archived {len(older)} superseded result(s) to {path}.")
+
+
+def remove_duplicates(apps, schema_editor):
+    """Make existing data fit the unique constraints below."""
+    db = schema_editor.connection.alias
+    renumber_duplicate_answers(db, apps.get_model("interviews", "InterviewAnswer"))
+    archive_duplicate_results(db, apps.get_model("interviews", "InterviewResult"))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('interviews', '0009_search_index'),
+    ]
+
+    operations = [
+        migrations.RunPython(remove_duplicates, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='interviewanswer',
+            constraint=models.UniqueConstraint(fields=('interview', 'candidate', 'question_number'), name='unique_answer_per_question'),
+        ),
+        migrations.AddConstraint(
+            model_name='interviewresult',
+            constraint=models.UniqueConstraint(fields=('interview', 'candidate'), name='unique_result_per_candidate'),
+        ),
+        migrations.CreateModel(
+            name='CallbackReceipt',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('key', models.CharField(max_length=255)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('interview', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='interviews.interview')),
+                ('result', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, to='interviews.interviewresult')),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('interview', 'key'), name='unique_callback_key')],
+            },
+        ),
+    ]
@@ -0,0 +1,39 @@
+# Generated by Django 4.2.7 on 2026-10-19 15:38
+
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('interviews', '0010_callback_idempotency'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CallbackInbox',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('payload', models.JSONField()),
+                ('idempotency_key', models.CharField(blank=True, max_length=255)),
+                ('status', models.CharField(choices=[('pending', 'Pending'), ('done', 'Done'), ('dead', 'Dead letter')], default='pending', max_length=20)),
+                ('attempts', models.PositiveIntegerField(default=0)),
+                ('last_error', models.TextField(blank=True)),
+                ('available_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('received_at', models.DateTimeField(auto_now_add=True)),
+                ('processed_at', models.DateTimeField(blank=True, null=True)),
+                ('interview', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='interviews.interview')),
+                ('result', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, to='interviews.interviewresult')),
+            ],
+            options={
+                'verbose_name_plural': 'callback inbox',
+                'indexes': [models.Index(fields=['status', 'available_at'], name='interviews__status_176658_idx')],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='callbackinbox',
+            constraint=models.UniqueConstraint(condition=models.Q(('idempotency_key', ''), _negated=True), fields=('interview', 'idempotency_key'), name='unique_inbox_key'),
+        ),
+    ]
@@ -0,0 +1,71 @@
+# Generated by Django 4.2.7 on 2026-10-19 15:41
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+from django.db.models import Count, Sum
+
+
+def backfill_standings(apps, schema_editor):
+    """One grouped pass over existing answers and results."""
+    db = schema_editor.connection.alias
+    InterviewAnswer = apps.get_model("interviews", "InterviewAnswer")
+    InterviewResult = apps.get_model("interviews", "InterviewResult")
+    CandidateStanding = apps.get_model("interviews", "CandidateStanding")
+
+    rows = {}
+    totals = InterviewAnswer.objects.using(db).values("interview_id", "candidate_id").annotate(
+        answered=Count("id"), scored=Count("ai_score"), total=Sum("ai_score")
+    )
+    for row in totals.iterator():
+        scored = row["scored"]
+        score_sum = row["total"] or 0
+        rows[(row["interview_id"], row["candidate_id"])] = CandidateStanding(
+            interview_id=row["interview_id"],
+            candidate_id=row["candidate_id"],
+            answered_count=row["answered"],
+            scored_count=scored,
+            score_sum=score_sum,
+            average_score=score_sum / scored if scored else None,
+        )
+    results = InterviewResult.objects.using(db).values_list("interview_id", "candidate_id", "overall_score")
+    for interview_id, candidate_id, overall in results.iterator():
+        standing = rows.setdefault(
+            (interview_id, candidate_id),
+            CandidateStanding(interview_id=interview_id, candidate_id=candidate_id),
+        )
+        standing.overall_score = overall
+    CandidateStanding.objects.using(db).bulk_create(rows.values(), batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('interviews', '0011_callbackinbox'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CandidateStanding',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('answered_count', models.IntegerField(default=0)),
+                ('scored_count', models.IntegerField(default=0)),
+                ('score_sum', models.IntegerField(default=0)),
+                ('average_score', models.FloatField(blank=True, null=True)),
+                ('overall_score', models.IntegerField(blank=True, null=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('candidate', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL)),
+                ('interview', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='interviews.interview')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['interview', '-average_score'], name='standing_average_idx'), models.Index(fields=['interview', '-overall_score'], name='standing_overall_idx')],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='candidatestanding',
+            constraint=models.UniqueConstraint(fields=('interview', 'candidate'), name='unique_standing_per_candidate'),
+        ),
+        migrations.RunPython(backfill_standings, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 4.2.7 on 2026-10-19 15:45
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('interviews', '0012_candidatestanding'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ResultPayload',
+            fields=[
+                ('result', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='payload_record', serialize=False, to='interviews.interviewresult')),
+                ('codec', models.CharField(default='zlib', max_length=10)),
+                ('data', models.BinaryField()),
+                ('size', models.IntegerField(default=0)),
+                ('stored_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 4.2.7 on 2026-10-19 15:46
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('interviews', '0013_resultpayload'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='interview',
+            name='deletion_requested_at',
+            field=models.DateTimeField(blank=True, db_index=True, null=True),
+        ),
+    ]
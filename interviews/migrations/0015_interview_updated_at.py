@@ -0,0 +1,25 @@
+from django.db import migrations, models
+from django.db.models import F
+import django.utils.timezone
+
+
+def copy_created_at(apps, schema_editor):
+    Interview = apps.get_model("interviews", "Interview")
+    Interview.objects.using(schema_editor.connection.alias).update(updated_at=F("created_at"))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('interviews', '0014_interview_deletion_requested_at'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='interview',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, default=django.utils.timezone.now),
+            preserve_default=False,
+        ),
+        migrations.RunPython(copy_created_at, migrations.RunPython.noop),
+    ]
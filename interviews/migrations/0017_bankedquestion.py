@@ -0,0 +1,28 @@
+# Generated by Django 4.2.7 on 2026-10-19 16:05
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('interviews', '0016_interviewresult_updated_at'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BankedQuestion',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('question_text', models.TextField()),
+                ('fingerprint', models.CharField(max_length=64)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('interview', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='interviews.interview')),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name='bankedquestion',
+            constraint=models.UniqueConstraint(fields=('interview', 'fingerprint'), name='unique_banked_question'),
+        ),
+    ]
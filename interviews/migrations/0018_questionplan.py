@@ -0,0 +1,35 @@
+# Generated by Django 4.2.7 on 2026-10-19 16:07
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('interviews', '0017_bankedquestion'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='interview',
+            name='plan_questions',
+            field=models.BooleanField(default=False),
+        ),
+        migrations.CreateModel(
+            name='QuestionPlan',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('questions', models.JSONField(default=list)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('candidate', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL)),
+                ('interview', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='interviews.interview')),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name='questionplan',
+            constraint=models.UniqueConstraint(fields=('interview', 'candidate'), name='unique_plan_per_candidate'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 4.2.7 on 2026-10-19 16:08
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('interviews', '0018_questionplan'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='interview',
+            name='batch_evaluation',
+            field=models.BooleanField(default=False),
+        ),
+    ]
@@ -0,0 +1,26 @@
+from django.db import migrations
+
+
+# interviews.payloads.SECRET_FIELDS when this migration was written.
+SECRET_FIELDS = {"token", "callback_token", "api_key", "authorization"}
+
+
+def redact_payloads(apps, schema_editor):
+    """Drop the callback token from payloads queued before it was stripped."""
+    CallbackInbox = apps.get_model("interviews", "CallbackInbox")
+    db = schema_editor.connection.alias
+    for item in CallbackInbox.objects.using(db).only("id", "payload").iterator(chunk_size=500):
+        if isinstance(item.payload, dict) and any(key.lower() in SECRET_FIELDS for key in item.payload):
+            item.payload = {key: value for key, value in item.payload.items() if key.lower() not in SECRET_FIELDS}
+            item.save(update_fields=["payload"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('interviews', '0019_interview_batch_evaluation'),
+    ]
+
+    operations = [
+        migrations.RunPython(redact_payloads, migrations.RunPython.noop),
+    ]
@@ -1,6 +1,7 @@
 from django.db import models
 from django.conf import settings
 from django.contrib.auth.models import User
+from django.utils import timezone
 
 
 class Interview(models.Model):
@@ -12,11 +13,25 @@ class Interview(models.Model):
         settings.AUTH_USER_MODEL, on_delete=models.CASCADE
     )
     created_at = models.DateTimeField(auto_now_add=True)
+    # Drives ETag/Last-Modified of the interview pages (see conditional.py)
+    updated_at = models.DateTimeField(auto_now=True)
 
     number_of_questions = models.IntegerField(default=5)  # ✅ NEW
     # Allows HR to specify evaluation criteria (rubric, scoring notes)
     evaluation_criteria = models.TextField(blank=True)
 
+    # Generate all of a candidate's questions in one call when their session
+    # starts (see plans.py) instead of one call per question.
+    plan_questions = models.BooleanField(default=False)
+    # Score all answers in one call after the last one (see evaluation.py)
+    # instead of one call per answer.
+    batch_evaluation = models.BooleanField(default=False)
+
+    # Set when HR deletes a large interview; the interview is hidden at once
+    # and its rows are removed in batches, by process_deletions with
+    # INTERVIEW_DELETE_IN_BACKGROUND (or by the view itself without it).
+    deletion_requested_at = models.DateTimeField(null=True, blank=True, db_index=True)
+
     def __str__(self):
         return self.title
 
@@ -36,6 +51,15 @@ class InterviewAnswer(models.Model):
 
     created_at = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        constraints = [
+            # One answer per question; lets api_callback upsert in bulk.
+            models.UniqueConstraint(
+                fields=["interview", "candidate", "question_number"],
+                name="unique_answer_per_question",
+            ),
+        ]
+
     def __str__(self):
         return f"{self.candidate.username} - {self.interview.title} (Q{self.question_number})"
 
@@ -48,15 +72,94 @@ class InterviewResult(models.Model):
     overall_score = models.IntegerField(null=True, blank=True)
     overall_feedback = models.TextField(blank=True)
 
-    # Keep raw JSON payload from the tool for auditing/debugging
+    # Legacy inline copy of the callback payload. New payloads are stored
+    # compressed in ResultPayload; compact_result_payloads moves old ones.
     raw_payload = models.JSONField(blank=True, null=True)
 
     created_at = models.DateTimeField(auto_now_add=True)
+    # Version of the row's cached markup in hr_results.html
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["interview", "candidate"], name="unique_result_per_candidate"),
+        ]
 
     def __str__(self):
         return f"Result: {self.candidate.username} - {self.interview.title} ({self.overall_score})"
 
 
+class ResultPayload(models.Model):
+    """Compressed raw callback payload of an InterviewResult, kept for auditing.
+
+    Lives in its own table so result listings never read it; see
+    interviews/payloads.py.
+    """
+    CODEC_ZLIB = "zlib"
+
+    result = models.OneToOneField(
+        InterviewResult, on_delete=models.CASCADE, primary_key=True, related_name="payload_record"
+    )
+    codec = models.CharField(max_length=10, default=CODEC_ZLIB)
+    data = models.BinaryField()
+    size = models.IntegerField(default=0)  # uncompressed bytes
+    stored_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"Payload of result #{self.result_id} ({len(self.data)}/{self.size} bytes)"
+
+
+class CallbackReceipt(models.Model):
+    """Idempotency key of an api_callback request that was already processed.
+
+    A retried callback carrying the same key gets the original response back
+    instead of being ingested twice.
+    """
+    interview = models.ForeignKey(Interview, on_delete=models.CASCADE)
+    key = models.CharField(max_length=255)
+    result = models.ForeignKey(InterviewResult, null=True, blank=True, on_delete=models.SET_NULL)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["interview", "key"], name="unique_callback_key"),
+        ]
+
+    def __str__(self):
+        return f"Callback {self.key} - {self.interview.title}"
+
+
+class CandidateStanding(models.Model):
+    """Leaderboard row: one candidate's aggregate scores for one interview.
+
+    Maintained incrementally by interviews/leaderboard.py whenever one of the
+    candidate's answers or their InterviewResult changes, so ranking queries
+    are index range scans instead of aggregates over every answer.
+    """
+    interview = models.ForeignKey(Interview, on_delete=models.CASCADE)
+    candidate = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE)
+
+    answered_count = models.IntegerField(default=0)
+    scored_count = models.IntegerField(default=0)
+    score_sum = models.IntegerField(default=0)
+    average_score = models.FloatField(null=True, blank=True)
+    overall_score = models.IntegerField(null=True, blank=True)
+
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["interview", "candidate"], name="unique_standing_per_candidate"),
+        ]
+        indexes = [
+            models.Index(fields=["interview", "-average_score"], name="standing_average_idx"),
+            models.Index(fields=["interview", "-overall_score"], name="standing_overall_idx"),
+        ]
+
+    def __str__(self):
+        return f"Standing: {self.candidate.username} - {self.interview.title} ({self.average_score})"
+
+
 class AskedQuestion(models.Model):
     """Record of a question shown to a candidate for a specific interview.
 
@@ -73,3 +176,89 @@ class AskedQuestion(models.Model):
 
     def __str__(self):
         return f"Asked: {self.candidate.username} - {self.interview.title} ({self.displayed_at})"
+
+
+class BankedQuestion(models.Model):
+    """Question generated ahead of time for an interview.
+
+    Filled by the warm_question_bank command (see interviews/question_bank.py)
+    so interview_session can serve a question without waiting on the model.
+    ``fingerprint`` is a hash of the normalized text and keeps the bank free
+    of duplicates.
+    """
+    interview = models.ForeignKey(Interview, on_delete=models.CASCADE)
+    question_text = models.TextField()
+    fingerprint = models.CharField(max_length=64)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["interview", "fingerprint"], name="unique_banked_question"),
+        ]
+
+    def __str__(self):
+        return f"Banked: {self.interview.title} - {self.question_text[:50]}"
+
+
+class QuestionPlan(models.Model):
+    """The ordered questions of one candidate's planned session.
+
+    Written once, when the session starts, for interviews with
+    ``plan_questions`` set; question N of the session is ``questions[N - 1]``.
+    """
+    interview = models.ForeignKey(Interview, on_delete=models.CASCADE)
+    candidate = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE)
+    questions = models.JSONField(default=list)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["interview", "candidate"], name="unique_plan_per_candidate"),
+        ]
+
+    def __str__(self):
+        return f"Plan: {self.candidate.username} - {self.interview.title} ({len(self.questions)} questions)"
+
+
+class CallbackInbox(models.Model):
+    """Raw api_callback payload waiting to be ingested by process_callback_inbox.
+
+    The callback view only authenticates and stores the body, then answers
+    202 Accepted; the batch processor does the actual writes. Rows that keep
+    failing are retried with backoff and end up in the ``dead`` state.
+    """
+    STATUS_PENDING = "pending"
+    STATUS_DONE = "done"
+    STATUS_DEAD = "dead"
+    STATUS_CHOICES = (
+        (STATUS_PENDING, "Pending"),
+        (STATUS_DONE, "Done"),
+        (STATUS_DEAD, "Dead letter"),
+    )
+
+    interview = models.ForeignKey(Interview, on_delete=models.CASCADE)
+    payload = models.JSONField()
+    idempotency_key = models.CharField(max_length=255, blank=True)
+
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default=STATUS_PENDING)
+    attempts = models.PositiveIntegerField(default=0)
+    last_error = models.TextField(blank=True)
+    available_at = models.DateTimeField(default=timezone.now)
+
+    received_at = models.DateTimeField(auto_now_add=True)
+    processed_at = models.DateTimeField(null=True, blank=True)
+    result = models.ForeignKey(InterviewResult, null=True, blank=True, on_delete=models.SET_NULL)
+
+    class Meta:
+        verbose_name_plural = "callback inbox"
+        indexes = [models.Index(fields=["status", "available_at"])]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["interview", "idempotency_key"],
+                condition=~models.Q(idempotency_key=""),
+                name="unique_inbox_key",
+            ),
+        ]
+
+    def __str__(self):
+        return f"Inbox #{self.pk} - {self.interview.title} ({self.status})"
@@ -0,0 +1,73 @@
+"""
+Compressed storage of raw api_callback payloads.
+
+The payload is serialised as compact JSON and zlib-compressed into a
+ResultPayload row keyed by the result, instead of the ``raw_payload``
+column on InterviewResult. Listings therefore never read it, and it is only
+decompressed by ``load_payload`` on the result detail page.
+
+Authentication fields (the callback token) are dropped before a payload is
+stored, and again when one is loaded, for rows stored before that.
+"""
+import json
+import zlib
+
+from django.core.serializers.json import DjangoJSONEncoder
+
+from .models import InterviewResult, ResultPayload
+
+
+COMPRESSION_LEVEL = 6
+
+# Top-level payload keys that authenticate the callback and must not be kept.
+SECRET_FIELDS = frozenset({"token", "callback_token", "api_key", "authorization"})
+
+
+def redact(payload):
+    """``payload`` without its authentication fields."""
+    if not isinstance(payload, dict):
+        return payload
+    return {key: value for key, value in payload.items() if key.lower() not in SECRET_FIELDS}
+
+
+def compress_payload(payload):
+    """Return ``(data, size)``: the compressed payload and its uncompressed length."""
+    raw = json.dumps(payload, cls=DjangoJSONEncoder, separators=(",", ":")).encode("utf-8")
+    return zlib.compress(raw, COMPRESSION_LEVEL), len(raw)
+
+
+def decompress_payload(data, codec=ResultPayload.CODEC_ZLIB):
+    if codec != ResultPayload.CODEC_ZLIB:
+        raise ValueError(f"Unknown payload codec: {codec}")
+    return json.loads(zlib.decompress(bytes(data)).decode("utf-8"))
+
+
+def store_payloads(payloads, update=True):
+    """Store ``{result_id: payload}``. Existing rows are replaced unless
+    ``update`` is False, in which case they are left alone."""
+    rows = []
+    for result_id, payload in payloads.items():
+        data, size = compress_payload(redact(payload))
+        rows.append(ResultPayload(result_id=result_id, data=data, size=size))
+    if not rows:
+        return
+    if update:
+        ResultPayload.objects.bulk_create(
+            rows,
+            batch_size=500,
+            update_conflicts=True,
+            unique_fields=["result"],
+            update_fields=["codec", "data", "size", "stored_at"],
+        )
+    else:
+        ResultPayload.objects.bulk_create(rows, batch_size=500, ignore_conflicts=True)
+
+
+def load_payload(result_id):
+    """The raw payload of a result, or None. Falls back to the legacy column
+    for rows that have not been compacted yet."""
+    row = ResultPayload.objects.filter(result_id=result_id).values_list("codec", "data").first()
+    if row is not None:
+        codec, data = row
+        return redact(decompress_payload(data, codec))
+    return redact(InterviewResult.objects.filter(pk=result_id).values_list("raw_payload", flat=True).first())
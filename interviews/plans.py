@@ -0,0 +1,55 @@
+"""
+Planned sessions.
+
+For interviews with ``plan_questions`` set, all of a candidate's questions
+are generated in one structured call when the session starts, instead of
+one call (plus duplicate retries) per question. The model checks the
+questions against each other within that call, and ``generate_question_plan``
+drops any near-duplicates in-process. The ordered list is stored as the
+candidate's QuestionPlan.
+Question N of the session is the plan's Nth entry, so reloading the page
+shows the same question again. If the plan came back short (or the
+interview gained questions since), the rest are generated one at a time as
+before.
+
+A failed plan call is not stored: questions are generated one at a time for
+the next RETRY_SECONDS, then planning is tried again for the rest of the
+session. Entries before the position the plan was made at are left empty.
+"""
+from django.core.cache import cache
+from django.db import IntegrityError, transaction
+
+from .ai import generate_question_plan
+from .models import QuestionPlan
+
+
+# How long a failed plan call is remembered before the session is planned again.
+RETRY_SECONDS = 120
+
+
+def _retry_key(interview, candidate):
+    return f"question-plan-failed:{interview.pk}:{candidate.pk}"
+
+
+def planned_question(interview, candidate, position, asked=()):
+    """Question ``position`` (0-based) of ``candidate``'s plan, planning the session on first use."""
+    plan = QuestionPlan.objects.filter(interview=interview, candidate=candidate).first()
+    if plan is None:
+        remaining = interview.number_of_questions - position
+        if remaining <= 0 or cache.get(_retry_key(interview, candidate)):
+            return None
+        questions = generate_question_plan(interview, remaining, asked_questions=list(asked))
+        if not questions:
+            cache.set(_retry_key(interview, candidate), True, RETRY_SECONDS)
+            return None
+        try:
+            with transaction.atomic():
+                plan = QuestionPlan.objects.create(
+                    interview=interview, candidate=candidate, questions=[""] * position + questions,
+                )
+        except IntegrityError:
+            # A concurrent first request planned the session already; keep its plan.
+            plan = QuestionPlan.objects.get(interview=interview, candidate=candidate)
+    if position < len(plan.questions):
+        return plan.questions[position] or None
+    return None
@@ -0,0 +1,226 @@
+"""
+Pre-generated question banks.
+
+Generating a question takes one or more model round trips. The first
+candidates of a newly published interview would all wait on them.
+``warm_up`` fills each interview's bank with QUESTION_BANK_SIZE distinct
+questions ahead of time. interview_session then serves a banked question
+the candidate has not seen yet (``take_question``) and only falls back to
+live generation once the bank is exhausted for that candidate.
+
+Interviews are filled concurrently by a bounded pool of threads. All the
+threads share one ``RateLimiter``, so the provider sees at most
+QUESTION_BANK_RATE_PER_MINUTE requests whatever the pool size. A rate-limit
+error (HTTP 429) backs the thread off exponentially. Each question is saved
+as soon as it is generated, and a fill only asks for what is missing, so an
+interrupted run resumes where it stopped.
+
+Used by the ``warm_question_bank`` management command and, with
+QUESTION_BANK_WARMUP_ON_SAVE, after HR creates or edits an interview. The
+warm-ups started by saves share one limiter per process, so concurrent
+saves stay within the rate together. Editing the outline clears the bank;
+a fill still running for the old outline notices before its next insert
+and stops.
+"""
+import hashlib
+import logging
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from django.conf import settings
+from django.db import connection, transaction
+
+from .ai import generate_question, normalize_question
+from .models import AskedQuestion, BankedQuestion, Interview
+
+
+logger = logging.getLogger(__name__)
+
+MAX_ATTEMPTS = 5  # rate-limit retries per question
+MAX_DUPLICATES = 3  # consecutive failed generations before an interview is given up on
+BACKOFF_SECONDS = 2.0
+PROMPT_QUESTIONS = 24  # banked questions listed in the prompt as "do not repeat"
+
+# Fields the questions are generated from; editing one invalidates the bank.
+SOURCE_FIELDS = ("title", "description", "required_skills", "responsibilities", "evaluation_criteria")
+
+
+def bank_size():
+    return getattr(settings, "QUESTION_BANK_SIZE", 10)
+
+
+def fingerprint(text):
+    return hashlib.sha256(normalize_question(text).encode("utf-8")).hexdigest()
+
+
+class RateLimiter:
+    """Token bucket shared by threads: ``per_minute`` requests, bursts of ``burst``."""
+
+    def __init__(self, per_minute, burst=1):
+        self.interval = 60.0 / per_minute if per_minute else 0.0
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        if not self.interval:
+            return
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.burst, self._tokens + (now - self._updated) / self.interval)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) * self.interval
+            time.sleep(wait)
+
+
+def _outline(interview):
+    return tuple(getattr(interview, field) for field in SOURCE_FIELDS)
+
+
+def _outline_changed(interview):
+    """True if ``interview`` was edited (or deleted) since it was loaded."""
+    current = Interview.objects.filter(pk=interview.pk).values_list(*SOURCE_FIELDS).first()
+    return current != _outline(interview)
+
+
+_shared_limiter = None
+_shared_limiter_lock = threading.Lock()
+
+
+def shared_limiter():
+    """The process-wide limiter used by warm-ups started from HR saves."""
+    global _shared_limiter
+    with _shared_limiter_lock:
+        if _shared_limiter is None:
+            _shared_limiter = RateLimiter(getattr(settings, "QUESTION_BANK_RATE_PER_MINUTE", 60))
+        return _shared_limiter
+
+
+def _is_rate_limited(error):
+    # google.api_core.exceptions.ResourceExhausted, without importing the SDK.
+    return type(error).__name__ in ("ResourceExhausted", "TooManyRequests") or "429" in str(error)
+
+
+def _generate(interview, asked, limiter):
+    for attempt in range(MAX_ATTEMPTS):
+        try:
+            return generate_question(interview, asked_questions=asked, fallback=False, throttle=limiter.acquire)
+        except Exception as e:
+            if not _is_rate_limited(e) or attempt == MAX_ATTEMPTS - 1:
+                raise
+            delay = BACKOFF_SECONDS * 2 ** attempt * (1 + random.random())
+            logger.info("Rate limited generating for interview #%s; retrying in %.1fs", interview.pk, delay)
+            time.sleep(delay)
+
+
+def fill_bank(interview, size, limiter, stop=None):
+    """Generate questions until ``interview`` has ``size`` banked; return how many were added."""
+    banked = BankedQuestion.objects.filter(interview=interview).order_by("-id")
+    added = duplicates = 0
+    while duplicates < MAX_DUPLICATES:
+        if stop is not None and stop.is_set():
+            break
+        # Re-read every round: another run may be filling the same bank.
+        texts = list(banked.values_list("question_text", flat=True))
+        if len(texts) >= size:
+            break
+        text = _generate(interview, texts[:PROMPT_QUESTIONS], limiter)
+        key = fingerprint(text) if text else None
+        if key is None or key in {fingerprint(t) for t in texts}:
+            duplicates += 1
+            continue
+        if _outline_changed(interview):
+            logger.info("Interview #%s was edited while its bank was filling; stopping", interview.pk)
+            break
+        BankedQuestion.objects.bulk_create(
+            [BankedQuestion(interview=interview, question_text=text, fingerprint=key)], ignore_conflicts=True,
+        )
+        added += 1
+        duplicates = 0
+    if duplicates >= MAX_DUPLICATES:
+        logger.warning("Question bank of interview #%s stopped at %s: the model keeps repeating itself",
+                       interview.pk, len(texts))
+    return added
+
+
+def _fill_in_thread(interview, size, limiter, stop):
+    try:
+        return fill_bank(interview, size, limiter, stop)
+    finally:
+        # Pool threads open their own connections; don't leak them.
+        connection.close()
+
+
+def warm_up(interviews, size=None, workers=4, per_minute=None, on_done=None, limiter=None):
+    """Fill the banks of ``interviews`` in a pool of ``workers`` threads.
+
+    The threads share ``limiter``, or a new one allowing ``per_minute``
+    requests. ``on_done(interview, added, error)`` is called as each interview
+    finishes. Returns the total number of questions added. On
+    KeyboardInterrupt the pending interviews are cancelled, the running ones
+    stop after their current question, and the interrupt is re-raised.
+    """
+    size = size or bank_size()
+    if limiter is None:
+        if per_minute is None:
+            per_minute = getattr(settings, "QUESTION_BANK_RATE_PER_MINUTE", 60)
+        limiter = RateLimiter(per_minute, burst=max(1, workers))
+    stop = threading.Event()
+    total = 0
+    pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="question-bank")
+    try:
+        futures = {pool.submit(_fill_in_thread, interview, size, limiter, stop): interview for interview in interviews}
+        for future in as_completed(futures):
+            interview = futures[future]
+            try:
+                added, error = future.result(), None
+            except Exception as e:
+                logger.exception("Warming the question bank of interview #%s failed", interview.pk)
+                added, error = 0, e
+            total += added
+            if on_done is not None:
+                on_done(interview, added, error)
+    except KeyboardInterrupt:
+        stop.set()
+        pool.shutdown(wait=True, cancel_futures=True)
+        raise
+    pool.shutdown(wait=True)
+    return total
+
+
+def warm_up_after_commit(interview):
+    """Fill ``interview``'s bank in a background thread once the transaction commits."""
+    def start():
+        threading.Thread(
+            target=warm_up, args=([interview],), kwargs={"workers": 1, "limiter": shared_limiter()},
+            name="question-bank", daemon=True,
+        ).start()
+    transaction.on_commit(start)
+
+
+def warmup_on_save():
+    return getattr(settings, "QUESTION_BANK_WARMUP_ON_SAVE", False)
+
+
+def clear_bank(interview):
+    return BankedQuestion.objects.filter(interview=interview).delete()[0]
+
+
+def take_question(interview, candidate, asked=()):
+    """A banked question ``candidate`` hasn't been shown yet, or None."""
+    shown = AskedQuestion.objects.filter(interview=interview, candidate=candidate).values("question_text")
+    texts = list(
+        BankedQuestion.objects.filter(interview=interview)
+        .exclude(question_text__in=shown)
+        .values_list("question_text", flat=True)[:bank_size()]
+    )
+    seen = {normalize_question(q) for q in asked if q}
+    texts = [t for t in texts if normalize_question(t) not in seen]
+    return random.choice(texts) if texts else None
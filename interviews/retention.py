@@ -0,0 +1,149 @@
+"""
+Retention and batched deletion.
+
+``archive_expired`` archives rows older than a cutoff to gzip-compressed
+JSONL and deletes them. ``delete_interview_in_batches`` removes an interview
+that was queued for deletion, its rows first. Both work in batches of
+``batch_size`` primary keys, walking the table in id order. Each batch is
+deleted in its own short transaction, so no single statement holds the
+write lock for long. Archive lines are written and flushed before their
+batch is deleted.
+
+Used by the ``apply_retention`` and ``process_deletions`` management
+commands, and by hr_delete_interview when no process_deletions worker runs
+(INTERVIEW_DELETE_IN_BACKGROUND off).
+"""
+import gzip
+import json
+import os
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+from django.utils import timezone
+
+from .models import (
+    AskedQuestion,
+    BankedQuestion,
+    CallbackInbox,
+    CallbackReceipt,
+    CandidateStanding,
+    Interview,
+    InterviewAnswer,
+    InterviewResult,
+    QuestionPlan,
+    ResultPayload,
+)
+from .payloads import decompress_payload, redact
+
+
+BATCH_SIZE = 500
+
+# kind -> (model, timestamp field). Inbox rows only get processed_at once
+# ingested, so pending and dead ones are never purged.
+POLICIES = {
+    "answers": (InterviewAnswer, "created_at"),
+    "asked_questions": (AskedQuestion, "displayed_at"),
+    "results": (InterviewResult, "created_at"),
+    "callback_inbox": (CallbackInbox, "processed_at"),
+}
+
+
+def retention_days(kind):
+    return getattr(settings, "RETENTION_DAYS", {}).get(kind)
+
+
+def archive_path(kind, archive_dir=None):
+    archive_dir = archive_dir or getattr(settings, "RETENTION_ARCHIVE_DIR", "archive")
+    os.makedirs(archive_dir, exist_ok=True)
+    stamp = timezone.now().strftime("%Y%m%dT%H%M%S")
+    return os.path.join(archive_dir, f"{kind}-{stamp}.jsonl.gz")
+
+
+def _with_payloads(rows):
+    """Put each result's raw payload back into its archived row."""
+    payloads = {
+        result_id: decompress_payload(data, codec)
+        for result_id, codec, data in ResultPayload.objects.filter(
+            result_id__in=[row["id"] for row in rows]
+        ).values_list("result_id", "codec", "data")
+    }
+    for row in rows:
+        if row["id"] in payloads:
+            row["raw_payload"] = payloads[row["id"]]
+    return rows
+
+
+def _batches(queryset, batch_size):
+    last_id = 0
+    while True:
+        rows = list(queryset.filter(id__gt=last_id).order_by("id").values()[:batch_size])
+        if not rows:
+            return
+        last_id = rows[-1]["id"]
+        yield rows
+
+
+def archive_expired(kind, days=None, batch_size=BATCH_SIZE, archive=None, dry_run=False):
+    """Archive and delete ``kind`` rows older than ``days``.
+
+    ``archive`` is the path of the .jsonl.gz file to write, or None to delete
+    without archiving. Returns the number of rows (that would be) removed.
+    """
+    model, field = POLICIES[kind]
+    days = days if days is not None else retention_days(kind)
+    if not days:
+        return 0
+    cutoff = timezone.now() - timedelta(days=days)
+    expired = model.objects.filter(**{f"{field}__lt": cutoff})
+    if dry_run:
+        return expired.count()
+
+    removed = 0
+    out = None
+    try:
+        for rows in _batches(expired, batch_size):
+            if model is InterviewResult:
+                rows = _with_payloads(rows)
+            elif model is CallbackInbox:
+                rows = [{**row, "payload": redact(row["payload"])} for row in rows]
+            if archive:
+                if out is None:
+                    out = gzip.open(archive, "at", encoding="utf-8")
+                for row in rows:
+                    out.write(json.dumps(row, cls=DjangoJSONEncoder) + "\n")
+                out.flush()
+            with transaction.atomic():
+                model.objects.filter(id__in=[row["id"] for row in rows]).delete()
+            removed += len(rows)
+    finally:
+        if out is not None:
+            out.close()
+    return removed
+
+
+def request_deletion(interview):
+    """Hide ``interview`` now and leave the deletion to process_deletions."""
+    interview.deletion_requested_at = timezone.now()
+    interview.save(update_fields=["deletion_requested_at"])
+
+
+def delete_interview_in_batches(interview, batch_size=BATCH_SIZE):
+    """Delete an interview's dependent rows batch by batch, then the interview."""
+    for model in (
+        AskedQuestion, BankedQuestion, QuestionPlan, InterviewAnswer, CandidateStanding,
+        CallbackInbox, CallbackReceipt, InterviewResult,
+    ):
+        rows = model.objects.filter(interview=interview)
+        while True:
+            ids = list(rows.order_by("id").values_list("id", flat=True)[:batch_size])
+            if not ids:
+                break
+            with transaction.atomic():
+                model.objects.filter(id__in=ids).delete()
+    interview.delete()
+
+
+def pending_deletions():
+    return Interview.objects.filter(deletion_requested_at__isnull=False).order_by("deletion_requested_at")
@@ -0,0 +1,254 @@
+"""
+Full-text search over interview answers and interviews for HR users.
+
+SQLite uses FTS5 external-content tables kept in sync by triggers; PostgreSQL
+uses stored, generated ``tsvector`` columns with GIN indexes. Either way the
+index is maintained by the database on every insert/update/delete, so there
+is nothing to run from Python after a write. Other databases fall back to
+``icontains`` scans.
+
+The index is created by migration 0009 and re-checked after every
+``migrate`` (see signals.py): SQLite drops a table's triggers whenever a
+migration rebuilds the table, so the DDL below is idempotent.
+"""
+from collections import namedtuple
+
+from django.db import connections, router
+from django.db.models import Q
+from django.utils.html import escape
+from django.utils.safestring import mark_safe
+
+from .models import Interview, InterviewAnswer
+
+
+# Private-use characters delimit highlighted terms in snippets until the
+# text has been HTML-escaped; they are then turned into <mark> tags.
+MARK_START, MARK_END = "\ue000", "\ue001"
+
+ANSWER_FTS = "interviews_answer_fts"
+INTERVIEW_FTS = "interviews_interview_fts"
+
+# (fts table, content table, indexed columns)
+SQLITE_INDEXES = (
+    (ANSWER_FTS, "interviews_interviewanswer", ("question", "answer", "ai_feedback")),
+    (INTERVIEW_FTS, "interviews_interview",
+     ("title", "description", "required_skills", "responsibilities", "evaluation_criteria")),
+)
+
+# (table, weighted columns) - weights A (highest) to D.
+POSTGRES_INDEXES = (
+    ("interviews_interviewanswer", (("question", "A"), ("answer", "B"), ("ai_feedback", "C"))),
+    ("interviews_interview", (("title", "A"), ("required_skills", "B"), ("description", "C"),
+                              ("responsibilities", "C"), ("evaluation_criteria", "D"))),
+)
+
+SearchHit = namedtuple("SearchHit", ["object", "rank", "snippet"])
+
+
+# ---------------------------------------------------------------------------
+# Index DDL
+# ---------------------------------------------------------------------------
+
+def _sqlite_ddl(fts, table, columns):
+    cols = ", ".join(columns)
+    new = ", ".join(f"new.{c}" for c in columns)
+    old = ", ".join(f"old.{c}" for c in columns)
+    return [
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS {fts} USING fts5({cols}, "
+        f"content='{table}', content_rowid='id', tokenize='porter unicode61')",
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_ai AFTER INSERT ON {table} BEGIN "
+        f"INSERT INTO {fts}(rowid, {cols}) VALUES (new.id, {new}); END",
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_ad AFTER DELETE ON {table} BEGIN "
+        f"INSERT INTO {fts}({fts}, rowid, {cols}) VALUES ('delete', old.id, {old}); END",
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_au AFTER UPDATE OF {cols} ON {table} BEGIN "
+        f"INSERT INTO {fts}({fts}, rowid, {cols}) VALUES ('delete', old.id, {old}); "
+        f"INSERT INTO {fts}(rowid, {cols}) VALUES (new.id, {new}); END",
+    ]
+
+
+def _postgres_ddl(table, weighted):
+    vector = " || ".join(
+        f"setweight(to_tsvector('english', coalesce({col}, '')), '{weight}')" for col, weight in weighted
+    )
+    return [
+        f"ALTER TABLE {table} ADD COLUMN IF NOT EXISTS search_vector tsvector "
+        f"GENERATED ALWAYS AS ({vector}) STORED",
+        f"CREATE INDEX IF NOT EXISTS {table}_search_idx ON {table} USING GIN (search_vector)",
+    ]
+
+
+def install_search_index(connection):
+    """Create the search tables/columns and triggers if they are missing."""
+    if connection.vendor == "sqlite":
+        statements = [sql for index in SQLITE_INDEXES for sql in _sqlite_ddl(*index)]
+    elif connection.vendor == "postgresql":
+        statements = [sql for index in POSTGRES_INDEXES for sql in _postgres_ddl(*index)]
+    else:
+        return
+    with connection.cursor() as cursor:
+        for sql in statements:
+            cursor.execute(sql)
+
+
+def rebuild_search_index(connection):
+    """Re-index every existing row (SQLite only; Postgres columns are generated)."""
+    if connection.vendor != "sqlite":
+        return
+    with connection.cursor() as cursor:
+        for fts, _table, _columns in SQLITE_INDEXES:
+            cursor.execute(f"INSERT INTO {fts}({fts}) VALUES ('rebuild')")
+
+
+def drop_search_index(connection):
+    if connection.vendor == "sqlite":
+        statements = [f"DROP TABLE IF EXISTS {fts}" for fts, _t, _c in SQLITE_INDEXES]
+        statements += [
+            f"DROP TRIGGER IF EXISTS {fts}_{suffix}"
+            for fts, _t, _c in SQLITE_INDEXES for suffix in ("ai", "ad", "au")
+        ]
+    elif connection.vendor == "postgresql":
+        statements = [f"ALTER TABLE {table} DROP COLUMN IF EXISTS search_vector" for table, _w in POSTGRES_INDEXES]
+    else:
+        return
+    with connection.cursor() as cursor:
+        for sql in statements:
+            cursor.execute(sql)
+
+
+# ---------------------------------------------------------------------------
+# Queries
+# ---------------------------------------------------------------------------
+
+def _fts5_query(text):
+    """Turn free text into an FTS5 query: every word must match, last one as a prefix."""
+    terms = ['"%s"' % t.replace('"', '""') for t in text.split()]
+    if terms:
+        terms[-1] += "*"
+    return " ".join(terms)
+
+
+def _highlight(snippet):
+    if not snippet:
+        return ""
+    html = escape(snippet).replace(MARK_START, "<mark>").replace(MARK_END, "</mark>")
+    return mark_safe(html)
+
+
+class SearchResults:
+    """Lazy, sliceable result set so it can be handed to Django's Paginator.
+
+    Only ``count()`` and slicing are supported; each slice runs one ranked
+    query for that page and loads the matching objects in bulk.
+    """
+
+    def __init__(self, model, user, text):
+        self.model = model
+        self.user = user
+        self.text = text.strip()
+        self.connection = connections[router.db_for_read(model)]
+
+    def _sql(self):
+        vendor = self.connection.vendor
+        if self.model is InterviewAnswer:
+            table, fts = "interviews_interviewanswer", ANSWER_FTS
+            join = "JOIN interviews_interview i ON i.id = t.interview_id"
+        else:
+            table, fts = "interviews_interview", INTERVIEW_FTS
+            join = "JOIN interviews_interview i ON i.id = t.id"
+
+        if vendor == "sqlite":
+            return (
+                f"FROM {fts} f JOIN {table} t ON t.id = f.rowid {join} "
+                f"WHERE {fts} MATCH %s AND i.created_by_id = %s "
+                "AND i.deletion_requested_at IS NULL",
+                f"bm25({fts})",
+                f"snippet({fts}, -1, '{MARK_START}', '{MARK_END}', '…', 16)",
+                "ASC",
+                [_fts5_query(self.text), self.user.pk],
+            )
+        if vendor == "postgresql":
+            source = "t.answer" if self.model is InterviewAnswer else "t.description"
+            return (
+                f"FROM {table} t {join} "
+                f"WHERE t.search_vector @@ websearch_to_tsquery('english', %s) AND i.created_by_id = %s "
+                "AND i.deletion_requested_at IS NULL",
+                "ts_rank_cd(t.search_vector, websearch_to_tsquery('english', %s))",
+                f"ts_headline('english', {source}, websearch_to_tsquery('english', %s), "
+                f"'StartSel={MARK_START}, StopSel={MARK_END}, MaxFragments=2, MaxWords=24')",
+                "DESC",
+                [self.text, self.user.pk],
+            )
+        return None
+
+    def _fallback_queryset(self):
+        if self.model is InterviewAnswer:
+            qs = InterviewAnswer.objects.filter(
+                interview__created_by=self.user, interview__deletion_requested_at__isnull=True
+            )
+            fields = ("question", "answer", "ai_feedback")
+        else:
+            qs = Interview.objects.filter(created_by=self.user, deletion_requested_at__isnull=True)
+            fields = ("title", "description", "required_skills", "responsibilities", "evaluation_criteria")
+        for word in self.text.split():
+            match = Q()
+            for field in fields:
+                match |= Q(**{f"{field}__icontains": word})
+            qs = qs.filter(match)
+        return qs.order_by("-created_at")
+
+    def count(self):
+        if not self.text:
+            return 0
+        sql = self._sql()
+        if sql is None:
+            return self._fallback_queryset().count()
+        where, _rank, _snippet, _order, params = sql
+        with self.connection.cursor() as cursor:
+            cursor.execute(f"SELECT COUNT(*) {where}", params)
+            return cursor.fetchone()[0]
+
+    def __len__(self):
+        return self.count()
+
+    def __getitem__(self, key):
+        if not isinstance(key, slice):
+            return self[key:key + 1][0]
+        if not self.text:
+            return []
+        start = key.start or 0
+        limit = (key.stop - start) if key.stop is not None else -1
+
+        sql = self._sql()
+        if sql is None:
+            objects = list(self._fallback_queryset()[key])
+            return [SearchHit(obj, None, "") for obj in self._hydrate([o.pk for o in objects])]
+
+        where, rank, snippet, order, params = sql
+        rank_params = [self.text] if "%s" in rank else []
+        snippet_params = [self.text] if "%s" in snippet else []
+        with self.connection.cursor() as cursor:
+            cursor.execute(
+                f"SELECT t.id, {rank} AS score, {snippet} AS snippet {where} "
+                f"ORDER BY score {order}, t.id DESC LIMIT %s OFFSET %s",
+                rank_params + snippet_params + params + [limit, start],
+            )
+            rows = cursor.fetchall()
+
+        objects = {obj.pk: obj for obj in self._hydrate([pk for pk, _score, _snip in rows])}
+        return [SearchHit(objects[pk], score, _highlight(snip)) for pk, score, snip in rows if pk in objects]
+
+    def _hydrate(self, ids):
+        qs = self.model.objects.using(self.connection.alias).filter(pk__in=ids)
+        if self.model is InterviewAnswer:
+            qs = qs.select_related("interview", "candidate")
+        by_id = qs.in_bulk()
+        return [by_id[pk] for pk in ids if pk in by_id]
+
+
+def search_answers(user, text):
+    """Answers to the user's interviews matching ``text`` (question, answer or feedback)."""
+    return SearchResults(InterviewAnswer, user, text)
+
+
+def search_interviews(user, text):
+    return SearchResults(Interview, user, text)
@@ -0,0 +1,48 @@
+from django.apps import apps
+from django.db import connections
+from django.db.models.signals import post_delete, post_migrate, post_save
+from django.dispatch import receiver
+
+from .cache import invalidate_answers, invalidate_asked_questions, invalidate_interview
+from .leaderboard import schedule_refresh
+from .models import AskedQuestion, Interview, InterviewAnswer, InterviewResult
+from .search import install_search_index
+
+
+@receiver(post_save, sender=Interview)
+@receiver(post_delete, sender=Interview)
+def invalidate_interview_cache(sender, instance, **kwargs):
+    invalidate_interview(instance.pk)
+
+
+@receiver(post_save, sender=InterviewAnswer)
+@receiver(post_delete, sender=InterviewAnswer)
+def invalidate_answers_cache(sender, instance, **kwargs):
+    invalidate_answers(instance.interview_id)
+
+
+@receiver(post_save, sender=AskedQuestion)
+@receiver(post_delete, sender=AskedQuestion)
+def invalidate_asked_questions_cache(sender, instance, created=True, **kwargs):
+    # Analytics only count who started; marking a question answered changes nothing.
+    if created:
+        invalidate_asked_questions(instance.interview_id)
+
+
+@receiver(post_save, sender=InterviewAnswer)
+@receiver(post_delete, sender=InterviewAnswer)
+@receiver(post_save, sender=InterviewResult)
+@receiver(post_delete, sender=InterviewResult)
+def update_standing(sender, instance, **kwargs):
+    schedule_refresh(instance.interview_id, instance.candidate_id)
+
+
+@receiver(post_migrate)
+def ensure_search_index(sender, using, plan=None, **kwargs):
+    # SQLite drops triggers when a migration rebuilds their table; put them
+    # back. Skip databases the interviews tables were never migrated into.
+    if sender is not apps.get_app_config("interviews"):
+        return
+    connection = connections[using]
+    if "interviews_interviewanswer" in connection.introspection.table_names():
+        install_search_index(connection)
@@ -0,0 +1,231 @@
+"""
+Deterministic synthetic data for scale testing.
+
+``create_people`` and ``create_interviews`` make HR users, candidates and
+interviews; ``generate_sessions`` then fills in interview sessions. A session is one candidate answering one interview: its answers,
+the AskedQuestion rows for the questions shown, and, for a share of
+completed sessions, an InterviewResult. Everything is written with
+``bulk_create`` in batches.
+
+Sessions are generated in chunks of ``CHUNK_SESSIONS``. Each chunk draws
+from its own ``random.Random`` seeded with (seed, chunk start), so the data
+is identical whether the chunks run in one process or in a pool of worker
+processes. Session ``s`` belongs to candidate ``s % candidates``, which
+takes interviews in a per-candidate rotation, so no (interview, candidate)
+pair repeats.
+
+Text lengths and scores follow simple distributions. Answers are
+log-normally sized, from a sentence to a few paragraphs. Scores are
+centred on a per-session ability with per-answer noise, and a few answers
+are left unscored. Most sessions are completed. Timestamps are spread over
+the year before the run. They are the only values that don't depend on the
+seed alone.
+"""
+import math
+import random
+from contextlib import contextmanager
+from datetime import timedelta
+
+from django.contrib.auth.models import User
+from django.db import connection, transaction
+from django.utils import timezone
+
+from accounts.models import Profile
+
+from .models import AskedQuestion, Interview, InterviewAnswer, InterviewResult
+
+
+CHUNK_SESSIONS = 2000
+COMPLETION_RATE = 0.75
+UNSCORED_RATE = 0.04
+HASH_MULTIPLIER = 2654435761  # Knuth's multiplicative hash, spreads candidates over interviews
+
+TOPICS = [
+    "database indexing", "query optimisation", "caching strategies", "REST API design", "authentication",
+    "transaction isolation", "message queues", "rate limiting", "unit testing", "code review",
+    "memory management", "concurrency", "Django middleware", "ORM relationships", "CSS layout",
+    "browser rendering", "event loops", "container orchestration", "observability", "schema migrations",
+]
+VERBS = ["Explain", "Describe", "Compare", "How would you approach", "Walk through", "What are the trade-offs of"]
+CONTEXTS = [
+    "in a high-traffic web application", "for a team of five engineers", "when latency matters most",
+    "in a legacy codebase", "under a strict memory budget", "for a multi-tenant SaaS product",
+]
+WORDS = (
+    "the a we it this that request response index query cache table row column user service worker queue "
+    "latency throughput database transaction lock thread process memory disk network client server "
+    "would should because when then first second finally usually often depends measure profile optimise "
+    "reduce avoid batch stream partition replicate retry timeout consistent available scalable simple"
+).split()
+FEEDBACK = [
+    "Clear and correct explanation.", "Good structure, but missing edge cases.",
+    "Mentions the key trade-offs.", "Too vague; give a concrete example.",
+    "Strong answer with practical detail.", "Partially correct; revisit the failure modes.",
+    "Well reasoned and concise.", "Confuses two related concepts.",
+]
+
+
+@contextmanager
+def explicit_timestamps():
+    """Let bulk_create keep the created_at/displayed_at values set on objects."""
+    fields = [
+        Interview._meta.get_field("created_at"),
+        InterviewAnswer._meta.get_field("created_at"),
+        InterviewResult._meta.get_field("created_at"),
+        AskedQuestion._meta.get_field("displayed_at"),
+    ]
+    for field in fields:
+        field.auto_now_add = False
+    try:
+        yield
+    finally:
+        for field in fields:
+            field.auto_now_add = True
+
+
+def _sentence(rng, words):
+    text = " ".join(rng.choice(WORDS) for _ in range(words))
+    return text[0].upper() + text[1:] + "."
+
+
+def _answer_text(rng):
+    # Median ~45 words, long tail up to a few hundred.
+    words = min(600, max(3, int(rng.lognormvariate(math.log(45), 0.8))))
+    sentences = []
+    while words > 0:
+        n = min(words, rng.randint(6, 18))
+        sentences.append(_sentence(rng, n))
+        words -= n
+    return " ".join(sentences)
+
+
+def _question_text(rng):
+    return f"{rng.choice(VERBS)} {rng.choice(TOPICS)} {rng.choice(CONTEXTS)}?"
+
+
+def _score(rng, ability):
+    if rng.random() < UNSCORED_RATE:
+        return None
+    return max(0, min(10, round(rng.gauss(ability, 1.3))))
+
+
+def create_people(prefix, hr_users, candidates, batch_size, seed):
+    """Create HR users, candidates and their profiles; return (hr_ids, candidate_ids)."""
+    rng = random.Random(f"{seed}:people")
+    now = timezone.now()
+    ids = {}
+    for role, count in (("HR", hr_users), ("CANDIDATE", candidates)):
+        label = "hr" if role == "HR" else "candidate"
+        ids[role] = []
+        for start in range(0, count, batch_size):
+            numbers = range(start, min(count, start + batch_size))
+            with transaction.atomic():
+                users = User.objects.bulk_create([
+                    User(
+                        username=f"{prefix}-{label}-{n}", email=f"{prefix}-{label}-{n}@example.com",
+                        password="!", date_joined=now - timedelta(days=rng.uniform(0, 730)),
+                    )
+                    for n in numbers
+                ], batch_size=batch_size)
+                if users and users[0].pk is None:
+                    # Backends without RETURNING (MySQL): look the ids up.
+                    users = list(User.objects.filter(username__in=[u.username for u in users]).order_by("id"))
+                Profile.objects.bulk_create([
+                    Profile(user=user, role=role, full_name=f"{label.title()} {n}")
+                    for n, user in zip(numbers, users)
+                ], batch_size=batch_size)
+            ids[role].extend(user.pk for user in users)
+    return ids["HR"], ids["CANDIDATE"]
+
+
+def create_interviews(hr_ids, count, batch_size, seed):
+    """Create ``count`` interviews owned by random HR users; return [(id, questions, created_at)]."""
+    rng = random.Random(f"{seed}:interviews")
+    now = timezone.now()
+    created = []
+    with explicit_timestamps():
+        for start in range(0, count, batch_size):
+            with transaction.atomic():
+                interviews = Interview.objects.bulk_create([
+                    Interview(
+                        title=f"{rng.choice(['Junior', 'Mid-level', 'Senior', 'Staff'])} "
+                              f"{rng.choice(['backend', 'frontend', 'full-stack', 'data', 'platform'])} engineer #{n}",
+                        description=" ".join(_sentence(rng, rng.randint(8, 16)) for _ in range(rng.randint(2, 5))),
+                        required_skills=", ".join(rng.sample(TOPICS, rng.randint(3, 6))),
+                        responsibilities=" ".join(_sentence(rng, rng.randint(6, 12)) for _ in range(rng.randint(1, 3))),
+                        evaluation_criteria=_sentence(rng, rng.randint(8, 20)) if rng.random() < 0.6 else "",
+                        number_of_questions=rng.choice([3, 5, 5, 5, 8, 10]),
+                        created_by_id=rng.choice(hr_ids),
+                        created_at=now - timedelta(days=rng.uniform(1, 365)),
+                    )
+                    for n in range(start, min(count, start + batch_size))
+                ], batch_size=batch_size)
+            created.extend((i.pk, i.number_of_questions, i.created_at) for i in interviews)
+    return created
+
+
+def generate_sessions(start, end, seed, interviews, candidate_ids, result_rate, batch_size):
+    """Write sessions ``start``..``end - 1``; return (answers, asked questions, results) created."""
+    rng = random.Random(f"{seed}:sessions:{start}")
+    now = timezone.now()
+    answers, asked, results = [], [], []
+    for s in range(start, end):
+        candidate_index, rotation = s % len(candidate_ids), s // len(candidate_ids)
+        interview_id, questions, opened = interviews[(candidate_index * HASH_MULTIPLIER + rotation) % len(interviews)]
+        candidate_id = candidate_ids[candidate_index]
+
+        completed = rng.random() < COMPLETION_RATE
+        answered = questions if completed else rng.randint(1, questions - 1) if questions > 1 else 0
+        ability = rng.gauss(6.2, 1.6)
+        at = opened + (now - opened) * rng.random()
+        scores = []
+        for q in range(1, answered + 1):
+            question = _question_text(rng)
+            asked.append(AskedQuestion(
+                interview_id=interview_id, candidate_id=candidate_id, question_text=question,
+                displayed_at=at, answered=True,
+            ))
+            at += timedelta(seconds=rng.randint(40, 600))
+            score = _score(rng, ability)
+            scores.append(score)
+            answers.append(InterviewAnswer(
+                interview_id=interview_id, candidate_id=candidate_id, question_number=q,
+                question=question, answer=_answer_text(rng),
+                ai_feedback=rng.choice(FEEDBACK) if score is not None else "", ai_score=score, created_at=at,
+            ))
+        if not completed:
+            # The question on screen when the candidate left.
+            asked.append(AskedQuestion(
+                interview_id=interview_id, candidate_id=candidate_id, question_text=_question_text(rng),
+                displayed_at=at, answered=False,
+            ))
+        elif rng.random() < result_rate:
+            scored = [x for x in scores if x is not None]
+            overall = round(sum(scored) / len(scored) * 10 + rng.gauss(0, 5)) if scored else None
+            results.append(InterviewResult(
+                interview_id=interview_id, candidate_id=candidate_id,
+                overall_score=max(0, min(100, overall)) if overall is not None else None,
+                overall_feedback=" ".join(rng.sample(FEEDBACK, 2)), created_at=at + timedelta(minutes=1),
+            ))
+
+    with explicit_timestamps(), transaction.atomic():
+        InterviewAnswer.objects.bulk_create(answers, batch_size=batch_size)
+        AskedQuestion.objects.bulk_create(asked, batch_size=batch_size)
+        InterviewResult.objects.bulk_create(results, batch_size=batch_size)
+    return len(answers), len(asked), len(results)
+
+
+def expected_answers_per_session(interviews):
+    """Mean answers per session under the completion model, for sizing the run."""
+    total = 0.0
+    for _id, questions, _created in interviews:
+        partial = questions / 2 if questions > 1 else 0  # mean of randint(1, questions - 1)
+        total += COMPLETION_RATE * questions + (1 - COMPLETION_RATE) * partial
+    return total / len(interviews)
+
+
+def analyze():
+    """Refresh planner statistics after a bulk load."""
+    if connection.vendor in ("sqlite", "postgresql"):
+        with connection.cursor() as cursor:
+            cursor.execute("ANALYZE")
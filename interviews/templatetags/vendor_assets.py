@@ -0,0 +1,12 @@
+from django import template
+
+from interviews.assets import vendor_url as _vendor_url
+
+
+register = template.Library()
+
+
+@register.simple_tag
+def vendor_url(name):
+    """URL of a vendored front-end asset, e.g. {% vendor_url "bootstrap.css" %}."""
+    return _vendor_url(name)
@@ -11,6 +11,11 @@ urlpatterns = [
     path("<int:interview_id>/chat/", views.ai_chat, name="ai_chat"),
     path("<int:interview_id>/callback/", views.api_callback, name="api_callback"),
     path("hr/results/", views.hr_results, name="hr_results"),
+    path("hr/search/", views.hr_search, name="hr_search"),
+    path("hr/export/", views.hr_export, name="hr_export"),
+    path("hr/analytics/<int:interview_id>/", views.hr_interview_analytics, name="hr_interview_analytics"),
+    path("hr/analytics/<int:interview_id>/api/", views.hr_interview_analytics_api, name="hr_interview_analytics_api"),
+    path("hr/leaderboard/<int:interview_id>/", views.hr_leaderboard, name="hr_leaderboard"),
     path("hr/results/<int:result_id>/", views.hr_view_result, name="hr_view_result"),
     path("hr/results/<int:result_id>/delete/", views.hr_delete_result, name="hr_delete_result"),
     path("hr/answer/<int:answer_id>/delete/", views.delete_answer, name="delete_answer"),
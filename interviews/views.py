@@ -1,21 +1,43 @@
 from django.shortcuts import render, get_object_or_404, redirect
 from django.contrib.auth.decorators import login_required
-from .models import Interview, InterviewAnswer, InterviewResult, AskedQuestion
+from .models import Interview, InterviewAnswer, InterviewResult, AskedQuestion, CallbackInbox
 from .ai import generate_question, evaluate_answer
+from .batching import batching_enabled, evaluate_answer_batched
+from .evaluation import evaluate_session, parse_evaluation
+from .cache import get_interview_or_404
+from .conditional import interview_etag, interview_last_modified
+from .search import search_answers, search_interviews
+from .export import FORMATS, iter_export
+from .ingest import InvalidPayload, ingest_callback, validate_payload
+from .leaderboard import ORDERINGS, annotate_positions, ranked, standing_for
+from .payloads import load_payload, redact
+from .plans import planned_question
+from .question_bank import SOURCE_FIELDS, clear_bank, take_question, warm_up_after_commit, warmup_on_save
+from .retention import delete_interview_in_batches, request_deletion
 from .forms import InterviewForm
 from django.contrib import messages
 from accounts.models import Profile
-from django.http import JsonResponse
-from django.views.decorators.http import require_POST
-from django.db.models import Avg, Max
+from django.http import JsonResponse, StreamingHttpResponse
+from django.core.paginator import Paginator
+from django.views.decorators.cache import cache_control
+from django.views.decorators.http import condition, require_POST
+from django.views.decorators.vary import vary_on_cookie
+from django.views.decorators.csrf import csrf_exempt
+from django.db.models import Avg, Count, Max
 from types import SimpleNamespace
 from django.conf import settings
+from django.db import IntegrityError, router, transaction
+from django.utils import timezone
 from django.contrib.auth.models import User
+from config.routers import pin_to_primary, read_from_replica
 import json
 
 @login_required
+@vary_on_cookie
+@cache_control(private=True, no_cache=True)
+@condition(etag_func=interview_etag, last_modified_func=interview_last_modified)
 def interview_detail(request, interview_id):
-    interview = get_object_or_404(Interview, id=interview_id)
+    interview = get_interview_or_404(interview_id)
     
     # Get user role
     user_role = None
@@ -26,7 +48,7 @@ def interview_detail(request, interview_id):
         pass
     
     # Check if user is the creator of this interview
-    is_creator = interview.created_by == request.user
+    is_creator = interview.created_by_id == request.user.id
     
     return render(request, "interviews/interview_detail.html", {
         "interview": interview,
@@ -36,13 +58,15 @@ def interview_detail(request, interview_id):
 
 @login_required
 def interview_session(request, interview_id):
-    interview = get_object_or_404(Interview, id=interview_id)
+    interview = get_interview_or_404(interview_id)
 
-    # How many questions already answered
-    answered_count = InterviewAnswer.objects.filter(
+    # How many questions already answered, and the last number used (HR may
+    # have deleted answers, leaving gaps)
+    answered = InterviewAnswer.objects.filter(
         interview=interview,
         candidate=request.user
-    ).count()
+    ).aggregate(count=Count('id'), last=Max('question_number'))
+    answered_count = answered['count']
 
     total_questions = interview.number_of_questions
 
@@ -66,26 +90,27 @@ def interview_session(request, interview_id):
         question = request.POST.get("question")
         answer = request.POST.get("answer")
 
-        result = evaluate_answer(question, answer)
-
-        score = None
-        feedback = result
-        if "Score:" in result:
-            try:
-                score = int(result.split("Score:")[1].split("\n")[0].strip())
-                feedback = result.split("Feedback:")[1].strip()
-            except:
-                pass
+        # In batch mode the answers are scored together after the last one.
+        score, feedback = None, ""
+        if not interview.batch_evaluation:
+            evaluate = evaluate_answer_batched if batching_enabled() else evaluate_answer
+            score, feedback = parse_evaluation(evaluate(question, answer))
 
-        InterviewAnswer.objects.create(
-            interview=interview,
-            candidate=request.user,
-            question_number=answered_count + 1,
-            question=question,
-            answer=answer,
-            ai_feedback=feedback,
-            ai_score=score
-        )
+        try:
+            with transaction.atomic():
+                InterviewAnswer.objects.create(
+                    interview=interview,
+                    candidate=request.user,
+                    question_number=(answered['last'] or 0) + 1,
+                    question=question,
+                    answer=answer,
+                    ai_feedback=feedback,
+                    ai_score=score
+                )
+        except IntegrityError:
+            # Double submit: another request saved this question number first.
+            messages.error(request, "This answer was already submitted; here is your next question.")
+            return redirect("interview_session", interview_id=interview.id)
 
         # Mark any AskedQuestion records for this interview/candidate/question as answered
         try:
@@ -98,6 +123,9 @@ def interview_session(request, interview_id):
         except Exception:
             pass
 
+        if interview.batch_evaluation and answered_count + 1 >= total_questions:
+            evaluate_session(interview, request.user)
+
         return redirect("interview_session", interview_id=interview.id)
 
     # 🟢 Generate NEXT question
@@ -112,7 +140,16 @@ def interview_session(request, interview_id):
     # Combine DB + session (recent first)
     asked = asked_db + asked_session
 
-    question = generate_question(interview, asked_questions=asked)
+    # Prefer the candidate's planned question, then a pre-generated one;
+    # generate one only once both are used up.
+    question = None
+    if interview.plan_questions:
+        question = planned_question(interview, request.user, answered_count, asked)
+    question = (
+        question
+        or take_question(interview, request.user, asked)
+        or generate_question(interview, asked_questions=asked)
+    )
 
     # Remember displayed question in session so subsequent generations avoid it
     # Keep only the most recent 24 entries to limit session size
@@ -165,6 +202,8 @@ def hr_create_interview(request):
             interview = form.save(commit=False)
             interview.created_by = request.user
             interview.save()
+            if warmup_on_save():
+                warm_up_after_commit(interview)
             messages.success(request, "Interview created successfully.")
             return redirect("hr_dashboard")
         else:
@@ -180,7 +219,7 @@ def hr_edit_interview(request, interview_id):
     interview = get_object_or_404(Interview, id=interview_id)
 
     # Only the creator (HR) may edit
-    if interview.created_by != request.user:
+    if interview.created_by_id != request.user.id:
         messages.error(request, "You do not have permission to edit this interview.")
         return redirect("hr_dashboard")
 
@@ -188,6 +227,12 @@ def hr_edit_interview(request, interview_id):
         form = InterviewForm(request.POST, instance=interview)
         if form.is_valid():
             form.save()
+            if set(form.changed_data) & set(SOURCE_FIELDS):
+                # The banked questions were written for the old outline.
+                clear_bank(interview)
+                if warmup_on_save():
+                    warm_up_after_commit(interview)
+            pin_to_primary(request)
             messages.success(request, "Interview updated successfully.")
             return redirect("hr_dashboard")
         else:
@@ -202,10 +247,10 @@ def hr_edit_interview(request, interview_id):
 @require_POST
 def hr_delete_interview(request, interview_id):
     """Allow HR users to delete interviews they created."""
-    interview = get_object_or_404(Interview, id=interview_id)
+    interview = get_object_or_404(Interview, id=interview_id, deletion_requested_at__isnull=True)
     
     # Only the creator (HR) may delete
-    if interview.created_by != request.user:
+    if interview.created_by_id != request.user.id:
         messages.error(request, "You do not have permission to delete this interview.")
         return redirect("hr_dashboard")
     
@@ -215,8 +260,28 @@ def hr_delete_interview(request, interview_id):
         messages.error(request, "Cannot delete interview with existing results. Delete results first.")
         return redirect("hr_dashboard")
     
+    # Small interviews are deleted right away. Large ones are removed in
+    # batches, so the cascade never holds a long write lock: by
+    # process_deletions where that worker runs, otherwise here.
+    inline_rows = getattr(settings, 'INTERVIEW_DELETE_INLINE_ROWS', 1000)
+    dependent_rows = (
+        InterviewAnswer.objects.filter(interview=interview)[:inline_rows + 1].count()
+        + AskedQuestion.objects.filter(interview=interview)[:inline_rows + 1].count()
+    )
+    if dependent_rows > inline_rows:
+        # Hidden first, so a failure part-way leaves it queued for deletion.
+        request_deletion(interview)
+        pin_to_primary(request)
+        if getattr(settings, 'INTERVIEW_DELETE_IN_BACKGROUND', False):
+            messages.success(request, "Interview scheduled for deletion. Its answers will be removed shortly.")
+            return redirect("hr_dashboard")
+        delete_interview_in_batches(interview)
+        messages.success(request, "Interview deleted successfully.")
+        return redirect("hr_dashboard")
+
     # Delete the interview
     interview.delete()
+    pin_to_primary(request)
     messages.success(request, "Interview deleted successfully.")
     return redirect("hr_dashboard")
 
@@ -225,7 +290,7 @@ def hr_delete_interview(request, interview_id):
 @require_POST
 def ai_chat(request, interview_id):
     """Simple endpoint to handle chat messages from the candidate and return AI responses."""
-    interview = get_object_or_404(Interview, id=interview_id)
+    interview = get_interview_or_404(interview_id)
 
     message = request.POST.get("message", "").strip()
     if not message:
@@ -239,13 +304,20 @@ def ai_chat(request, interview_id):
     return JsonResponse({"ok": True, "response": ai_response})
 
 
+@csrf_exempt
 @require_POST
 def api_callback(request, interview_id):
     """Endpoint for external tool (e.g., Gemini tool use) to POST evaluation results.
 
+    The payload is authenticated and ingested right away. With
+    CALLBACK_INBOX = True it is stored in the callback inbox instead, and the
+    endpoint answers 202 Accepted; ``process_callback_inbox`` writes the
+    answers and result.
+
     Expected JSON body example:
     {
       "token": "<callback-token>" ,
+      "idempotency_key": "<unique id of this delivery>",  (or an Idempotency-Key header)
       "candidate_username": "user1",
       "overall_score": 78,
       "overall_feedback": "Good answers...",
@@ -269,54 +341,50 @@ def api_callback(request, interview_id):
     candidate_username = payload.get('candidate_username')
     if not candidate_username:
         return JsonResponse({"ok": False, "error": "missing_candidate"}, status=400)
-
     try:
-        candidate = User.objects.get(username=candidate_username)
-    except User.DoesNotExist:
-        return JsonResponse({"ok": False, "error": "candidate_not_found"}, status=404)
-
-    interview = get_object_or_404(Interview, id=interview_id)
+        validate_payload(payload)
+    except InvalidPayload as e:
+        return JsonResponse({"ok": False, "error": "invalid_payload", "detail": str(e)}, status=400)
 
-    # Store / update per-answer results
-    answers = payload.get('answers', [])
-    for a in answers:
-        qnum = a.get('question_number')
-        question = a.get('question', '')
-        answer_text = a.get('answer', '')
-        ai_score = a.get('ai_score')
-        ai_feedback = a.get('ai_feedback', '')
+    interview = get_interview_or_404(interview_id)
 
-        if qnum is None:
-            continue
-
-        InterviewAnswer.objects.update_or_create(
-            interview=interview,
-            candidate=candidate,
-            question_number=qnum,
-            defaults={
-                'question': question,
-                'answer': answer_text,
-                'ai_score': ai_score,
-                'ai_feedback': ai_feedback,
-            }
-        )
+    # Retries carrying the same key are answered from the first delivery.
+    idempotency_key = request.headers.get('Idempotency-Key') or payload.get('idempotency_key')
 
-    # Store overall result
-    overall_score = payload.get('overall_score')
-    overall_feedback = payload.get('overall_feedback', '')
+    if not getattr(settings, 'CALLBACK_INBOX', False):
+        try:
+            candidate = User.objects.get(username=candidate_username)
+        except User.DoesNotExist:
+            return JsonResponse({"ok": False, "error": "candidate_not_found"}, status=404)
 
-    result = InterviewResult.objects.create(
-        interview=interview,
-        candidate=candidate,
-        overall_score=overall_score,
-        overall_feedback=overall_feedback,
-        raw_payload=payload,
-    )
+        # Upsert all answers and the overall result in one transaction
+        result, duplicate = ingest_callback(interview, candidate, payload, idempotency_key=idempotency_key)
+        return JsonResponse({"ok": True, "result_id": result.id if result else None, "duplicate": duplicate})
 
-    return JsonResponse({"ok": True, "result_id": result.id})
+    # Store the raw payload; process_callback_inbox ingests it in bulk later.
+    try:
+        with transaction.atomic():
+            item = CallbackInbox.objects.create(
+                interview=interview,
+                payload=redact(payload),
+                idempotency_key=idempotency_key or '',
+            )
+        duplicate = False
+    except IntegrityError:
+        # Only the idempotency key is unique; without one (or if the first
+        # delivery's row is gone again) there is nothing to answer from.
+        item = None
+        if idempotency_key:
+            item = CallbackInbox.objects.filter(interview=interview, idempotency_key=idempotency_key).first()
+        if item is None:
+            return JsonResponse({"ok": False, "error": "not_stored"}, status=409)
+        duplicate = True
+
+    return JsonResponse({"ok": True, "inbox_id": item.id, "status": item.status, "duplicate": duplicate}, status=202)
 
 
 @login_required
+@read_from_replica
 def hr_results(request):
     # Show only results for interviews created by this HR user
     try:
@@ -331,8 +399,8 @@ def hr_results(request):
     
     # Filter results to show only interviews created by this HR user
     persisted = list(InterviewResult.objects.filter(
-        interview__created_by=request.user
-    ).select_related('candidate', 'interview').order_by('-created_at'))
+        interview__created_by=request.user, interview__deletion_requested_at__isnull=True
+    ).select_related('candidate', 'interview').defer('raw_payload').order_by('-created_at'))
 
     # Build a list of result objects. Start with persisted InterviewResult records.
     results_list = []
@@ -345,7 +413,7 @@ def hr_results(request):
     # compute an aggregated score and include them as transient results.
     # Filter to show only interviews created by this HR user
     agg = InterviewAnswer.objects.filter(
-        interview__created_by=request.user
+        interview__created_by=request.user, interview__deletion_requested_at__isnull=True
     ).values('interview_id', 'candidate_id').annotate(
         avg_score=Avg('ai_score'), last_seen=Max('created_at')
     )
@@ -353,14 +421,14 @@ def hr_results(request):
     from django.contrib.auth import get_user_model
     User = get_user_model()
 
+    agg = [a for a in agg if (a['interview_id'], a['candidate_id']) not in existing_pairs]
+    interviews = Interview.objects.in_bulk({a['interview_id'] for a in agg})
+    candidates = User.objects.in_bulk({a['candidate_id'] for a in agg})
+
     for a in agg:
-        pair = (a['interview_id'], a['candidate_id'])
-        if pair in existing_pairs:
-            continue
-        try:
-            interview = Interview.objects.get(id=a['interview_id'])
-            candidate = User.objects.get(id=a['candidate_id'])
-        except (Interview.DoesNotExist, User.DoesNotExist):
+        interview = interviews.get(a['interview_id'])
+        candidate = candidates.get(a['candidate_id'])
+        if interview is None or candidate is None:
             continue
 
         pseudo = SimpleNamespace(
@@ -380,14 +448,158 @@ def hr_results(request):
 
 
 @login_required
+@read_from_replica
+def hr_search(request):
+    """Ranked full-text search over answers (or interviews) of this HR user's interviews."""
+    try:
+        profile = Profile.objects.get(user=request.user)
+    except Profile.DoesNotExist:
+        messages.error(request, "Profile not found. Access denied.")
+        return redirect("hr_dashboard")
+
+    if profile.role != "HR":
+        messages.error(request, "Only HR users can search results.")
+        return redirect("candidate_dashboard")
+
+    query = request.GET.get("q", "").strip()
+    scope = "interviews" if request.GET.get("in") == "interviews" else "answers"
+    if scope == "interviews":
+        results = search_interviews(request.user, query)
+    else:
+        results = search_answers(request.user, query)
+
+    page = Paginator(results, 20).get_page(request.GET.get("page"))
+
+    return render(request, "interviews/hr_search.html", {
+        "query": query,
+        "scope": scope,
+        "page": page,
+    })
+
+
+@login_required
+@read_from_replica
+def hr_export(request):
+    """Stream all answers or results of this HR user's interviews as CSV or JSONL.
+
+    Query parameters: ``kind`` (answers|results), ``format`` (csv|jsonl) and
+    an optional ``interview`` id.
+    """
+    try:
+        profile = Profile.objects.get(user=request.user)
+    except Profile.DoesNotExist:
+        messages.error(request, "Profile not found. Access denied.")
+        return redirect("hr_dashboard")
+
+    if profile.role != "HR":
+        messages.error(request, "Only HR users can export results.")
+        return redirect("candidate_dashboard")
+
+    kind = "results" if request.GET.get("kind") == "results" else "answers"
+    fmt = request.GET.get("format", "csv")
+    if fmt not in FORMATS:
+        fmt = "csv"
+    interview_id = request.GET.get("interview")
+    interview_id = int(interview_id) if interview_id and interview_id.isdigit() else None
+
+    # The body is generated after this view returns, outside read_from_replica,
+    # so pin the database alias now.
+    using = router.db_for_read(InterviewAnswer)
+    response = StreamingHttpResponse(
+        iter_export(request.user, kind, fmt, interview_id, using=using),
+        content_type=FORMATS[fmt],
+    )
+    filename = f"{kind}-{timezone.now():%Y%m%d-%H%M}.{fmt}"
+    response["Content-Disposition"] = f'attachment; filename="{filename}"'
+    return response
+
+
+def _owned_interview_or_redirect(request, interview_id):
+    interview = get_interview_or_404(interview_id)
+    if interview.created_by_id != request.user.id:
+        messages.error(request, "You do not have permission to view this interview.")
+        return None
+    return interview
+
+
+@login_required
+@read_from_replica
+def hr_interview_analytics(request, interview_id):
+    """Score distribution, per-question difficulty and completion funnel of one interview."""
+    interview = _owned_interview_or_redirect(request, interview_id)
+    if interview is None:
+        return redirect("hr_dashboard")
+
+    # Lazy import: NumPy is only needed by this page.
+    from .analytics import get_interview_analytics
+
+    stats = get_interview_analytics(interview)
+    max_count = max([h["count"] for h in stats["score_histogram"]] + [1])
+    return render(request, "interviews/hr_analytics.html", {
+        "interview": interview,
+        "stats": stats,
+        "max_count": max_count,
+    })
+
+
+@login_required
+@read_from_replica
+def hr_interview_analytics_api(request, interview_id):
+    interview = get_interview_or_404(interview_id)
+    if interview.created_by_id != request.user.id:
+        return JsonResponse({"ok": False, "error": "forbidden"}, status=403)
+
+    from .analytics import get_interview_analytics
+
+    return JsonResponse({"ok": True, "analytics": get_interview_analytics(interview)})
+
+
+LEADERBOARD_PAGE_SIZE = 50
+
+
+@login_required
+@read_from_replica
+def hr_leaderboard(request, interview_id):
+    """Candidates of one interview ranked by average answer score or overall result."""
+    interview = _owned_interview_or_redirect(request, interview_id)
+    if interview is None:
+        return redirect("hr_dashboard")
+
+    by = request.GET.get("by", "average")
+    if by not in ORDERINGS:
+        by = "average"
+    page = Paginator(ranked(interview, by), LEADERBOARD_PAGE_SIZE).get_page(request.GET.get("page"))
+    page.object_list = annotate_positions(page.object_list, interview, by)
+    return render(request, "interviews/hr_leaderboard.html", {
+        "interview": interview,
+        "page": page,
+        "by": by,
+    })
+
+
+@login_required
+@read_from_replica
 def hr_view_result(request, result_id):
-    result = get_object_or_404(InterviewResult, id=result_id)
+    result = get_object_or_404(
+        InterviewResult.objects.select_related('interview', 'candidate').defer('raw_payload'), id=result_id
+    )
     # Gather per-question answers for this interview & candidate
     answers = InterviewAnswer.objects.filter(interview=result.interview, candidate=result.candidate).order_by('question_number')
-    return render(request, "interviews/hr_result_detail.html", {"result": result, "answers": answers})
+    standing = standing_for(result.interview, result.candidate)
+    # The raw callback payload is only read here, and only for the interview's owner.
+    payload = None
+    if result.interview.created_by_id == request.user.id:
+        payload = load_payload(result.id)
+    return render(request, "interviews/hr_result_detail.html", {
+        "result": result,
+        "answers": answers,
+        "standing": standing,
+        "payload": json.dumps(payload, indent=2) if payload is not None else None,
+    })
 
 
 @login_required
+@read_from_replica
 def hr_view_result_by_candidate(request, interview_id, candidate_id):
     interview = get_object_or_404(Interview, id=interview_id)
     from django.contrib.auth import get_user_model
@@ -406,7 +618,8 @@ def hr_view_result_by_candidate(request, interview_id, candidate_id):
         created_at=None,
     )
 
-    return render(request, "interviews/hr_result_detail.html", {"result": pseudo, "answers": answers})
+    standing = standing_for(interview, candidate)
+    return render(request, "interviews/hr_result_detail.html", {"result": pseudo, "answers": answers, "standing": standing})
 
 @login_required
 @login_required
@@ -429,6 +642,7 @@ def delete_answer(request, answer_id):
     candidate = answer.candidate
 
     answer.delete()
+    pin_to_primary(request)
     messages.success(request, "Answer deleted.")
 
     # Prefer redirecting back to the page that submitted the delete (safe check)
@@ -462,9 +676,10 @@ def hr_delete_result(request, result_id):
         messages.error(request, "Only HR users can delete results.")
         return redirect("hr_results")
 
-    result = get_object_or_404(InterviewResult, id=result_id)
+    result = get_object_or_404(InterviewResult.objects.defer('raw_payload'), id=result_id)
 
     # Delete only the aggregated/persisted InterviewResult record.
     result.delete()
+    pin_to_primary(request)
     messages.success(request, "Result deleted successfully.")
     return redirect("hr_results")
\ No newline at end of file